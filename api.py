@@ -0,0 +1,282 @@
+# API HTTP de sólo lectura con los datos de extranjeros/as por provincia y año
+# que muestra el tablero, para descargarlos sin pasar por las sesiones de
+# streamlit. Corre como un proceso aparte, al lado de la app:
+#   python api.py [--puerto 8502] [--direccion 127.0.0.1]
+#
+#   GET /                      años, provincias y nacionalidades disponibles
+#   GET /extranjeros.csv       una fila por año, provincia y nacionalidad
+#   GET /extranjeros.json
+#       ?desde=2015&hasta=2020               rango de años (inclusive)
+#       &provincia=Salta&provincia=Jujuy     se puede repetir
+#       &nacionalidad=Bolivia                se puede repetir
+#
+# Las respuestas salen por partes (chunked), comprimidas con gzip si el cliente
+# lo acepta, y con un ETag que depende sólo de los datos y de la consulta: un
+# pedido repetido con If-None-Match recibe un 304 sin tocar los datos.
+import argparse
+import csv
+import hashlib
+import io
+import json
+import threading
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from datos import ANIOS, NACIONALIDADES, construir_dataset, dataset_al_dia, leer_dataset, version_extranjeros
+
+COLUMNAS = ["anio", "provincia", "nacionalidad", "estudiantes", "porcentaje", "total_extranjeros"]
+FORMATOS = {"csv": "text/csv; charset=utf-8", "json": "application/json; charset=utf-8"}
+
+FILAS_POR_PARTE = 500
+MAX_AGE = 3600
+
+
+class Datos:
+    # los datos en formato largo, cargados una vez y recargados sólo si cambian
+    # los csv de origen (por ejemplo, después de correr ingesta.py)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self.tabla = None
+
+    def version(self):
+        return hashlib.sha256(repr(version_extranjeros()).encode()).hexdigest()[:16]
+
+    def actuales(self):
+        version = self.version()
+        with self._lock:
+            if version != self._version:
+                if not dataset_al_dia():
+                    construir_dataset()
+                self.tabla = tabla_larga(leer_dataset())
+                self._version = version
+            return self._version, self.tabla
+
+
+def tabla_larga(data):
+    cantidades = (data[NACIONALIDADES].rename_axis(columns="nacionalidad")
+                  .stack(future_stack=True).rename("estudiantes"))
+    porcentajes = (data[[f"porcentaje_{n}" for n in NACIONALIDADES]]
+                   .set_axis(NACIONALIDADES, axis=1).rename_axis(columns="nacionalidad")
+                   .stack(future_stack=True).rename("porcentaje"))
+    largo = cantidades.to_frame().join(porcentajes).join(data["total_extranjeros"]).reset_index()
+    # hasta 2013 Venezuela no está discriminada (va dentro de Otros): sin filas
+    largo = largo.dropna(subset=["estudiantes"])
+    largo["provincia"] = largo["provincia"].astype(str)
+    largo = largo.astype({"anio": int, "estudiantes": int, "total_extranjeros": int})
+    return largo[COLUMNAS].reset_index(drop=True)
+
+
+class ConsultaInvalida(ValueError):
+    pass
+
+
+def leer_consulta(query, provincias):
+    parametros = parse_qs(query)
+    desconocidos = set(parametros) - {"desde", "hasta", "provincia", "nacionalidad"}
+    if desconocidos:
+        raise ConsultaInvalida(f"parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+
+    try:
+        desde = int(parametros.get("desde", [ANIOS[0]])[-1])
+        hasta = int(parametros.get("hasta", [ANIOS[-1]])[-1])
+    except ValueError:
+        raise ConsultaInvalida("desde y hasta deben ser años") from None
+    if desde > hasta:
+        raise ConsultaInvalida("desde no puede ser mayor que hasta")
+
+    elegidas = sorted(set(parametros.get("provincia", [])))
+    if set(elegidas) - set(provincias):
+        raise ConsultaInvalida(f"provincias desconocidas: {', '.join(sorted(set(elegidas) - set(provincias)))}")
+    nacionalidades = sorted(set(parametros.get("nacionalidad", [])))
+    if set(nacionalidades) - set(NACIONALIDADES):
+        raise ConsultaInvalida(f"nacionalidades desconocidas: "
+                               f"{', '.join(sorted(set(nacionalidades) - set(NACIONALIDADES)))}")
+
+    # forma canónica: dos consultas equivalentes comparten ETag
+    return {"desde": max(desde, ANIOS[0]), "hasta": min(hasta, ANIOS[-1]),
+            "provincia": elegidas, "nacionalidad": nacionalidades}
+
+
+def filtrar(tabla, consulta):
+    filtro = tabla["anio"].between(consulta["desde"], consulta["hasta"])
+    if consulta["provincia"]:
+        filtro &= tabla["provincia"].isin(consulta["provincia"])
+    if consulta["nacionalidad"]:
+        filtro &= tabla["nacionalidad"].isin(consulta["nacionalidad"])
+    return tabla[filtro]
+
+
+def partes_csv(filas):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUMNAS)
+    for i, fila in enumerate(filas, 1):
+        escritor.writerow(fila)
+        if i % FILAS_POR_PARTE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def partes_json(filas):
+    parte = ["["]
+    for i, fila in enumerate(filas):
+        parte.append(("," if i else "") + json.dumps(dict(zip(COLUMNAS, fila)), ensure_ascii=False))
+        if len(parte) >= FILAS_POR_PARTE:
+            yield "".join(parte)
+            parte = []
+    parte.append("]")
+    yield "".join(parte)
+
+
+def etag(version, ruta, consulta, gzip):
+    clave = json.dumps([version, ruta, consulta], sort_keys=True)
+    valor = hashlib.sha256(clave.encode()).hexdigest()[:20]
+    return f'"{valor}-gz"' if gzip else f'"{valor}"'
+
+
+def coincide(if_none_match, valor):
+    # comparación débil: se ignoran W/ y el sufijo de la codificación
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = valor.strip('"').removesuffix("-gz")
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip().removeprefix("W/").strip('"')
+        if candidato.removesuffix("-gz") == base:
+            return True
+    return False
+
+
+def acepta_gzip(accept_encoding):
+    for codificacion in (accept_encoding or "").split(","):
+        nombre, _, parametros = codificacion.strip().partition(";")
+        if nombre.strip().lower() in ("gzip", "*"):
+            return parametros.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SocioHackatonAPI"
+    datos = None
+
+    def do_GET(self):
+        # http.server decodifica la línea del pedido como latin-1: se recuperan
+        # los acentos que algunos clientes mandan sin escapar (?provincia=Córdoba)
+        url = urlsplit(self.path.encode("latin-1").decode("utf-8", "replace"))
+        if url.path == "/":
+            self.indice()
+            return
+        nombre, _, formato = url.path.lstrip("/").partition(".")
+        if nombre != "extranjeros" or formato not in FORMATOS:
+            self.error(HTTPStatus.NOT_FOUND, "rutas disponibles: /, /extranjeros.csv, /extranjeros.json")
+            return
+
+        version, tabla = self.datos.actuales()
+        try:
+            consulta = leer_consulta(url.query, set(tabla["provincia"]))
+        except ConsultaInvalida as error:
+            self.error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+
+        gzip = acepta_gzip(self.headers.get("Accept-Encoding"))
+        valor = etag(version, url.path, consulta, gzip)
+        if coincide(self.headers.get("If-None-Match"), valor):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.cabeceras_cache(valor)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        filas = filtrar(tabla, consulta).itertuples(index=False, name=None)
+        partes = partes_csv(filas) if formato == "csv" else partes_json(filas)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", FORMATOS[formato])
+        if formato == "csv":
+            self.send_header("Content-Disposition", 'attachment; filename="extranjeros.csv"')
+        self.cabeceras_cache(valor)
+        if gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        compresor = zlib.compressobj(wbits=31) if gzip else None
+        for parte in partes:
+            datos = parte.encode()
+            self.enviar_parte(compresor.compress(datos) if gzip else datos)
+        if gzip:
+            self.enviar_parte(compresor.flush())
+        self.wfile.write(b"0\r\n\r\n")
+
+    def indice(self):
+        _, tabla = self.datos.actuales()
+        cuerpo = json.dumps({
+            "rutas": ["/extranjeros.csv", "/extranjeros.json"],
+            "parametros": {"desde": "año inicial", "hasta": "año final",
+                           "provincia": "se puede repetir", "nacionalidad": "se puede repetir"},
+            "anios": [ANIOS[0], ANIOS[-1]],
+            "provincias": sorted(set(tabla["provincia"])),
+            "nacionalidades": NACIONALIDADES,
+            "columnas": COLUMNAS,
+        }, ensure_ascii=False, indent=2).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", FORMATOS["json"])
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def cabeceras_cache(self, valor):
+        self.send_header("ETag", valor)
+        self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def enviar_parte(self, datos):
+        if datos:
+            self.wfile.write(f"{len(datos):x}\r\n".encode() + datos + b"\r\n")
+
+    def error(self, codigo, mensaje):
+        cuerpo = json.dumps({"error": mensaje}, ensure_ascii=False).encode()
+        self.send_response(codigo)
+        self.send_header("Content-Type", FORMATOS["json"])
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def servidor(direccion="127.0.0.1", puerto=8502):
+    Manejador.datos = Datos()
+    Manejador.datos.actuales()  # la primera carga no la paga el primer pedido
+    http = ThreadingHTTPServer((direccion, puerto), Manejador)
+    http.daemon_threads = True
+    return http
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--direccion", default="127.0.0.1", help="dirección en la que escucha (0.0.0.0 para todas)")
+    parser.add_argument("--puerto", type=int, default=8502)
+    args = parser.parse_args()
+
+    http = servidor(args.direccion, args.puerto)
+    print(f"API en http://{args.direccion}:{args.puerto}/")
+    try:
+        http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# costo de arranque de cada página en un proceso nuevo: tiempo de importar
+# app.py más el módulo de la página, primer render (caches vacíos) y memoria
+# residente. Como referencia, lo mismo importando todas las librerías que
+# app.py cargaba antes al inicio, sin importar la página visitada.
+# Uso, desde la raíz del repositorio: python -m benchmarks.arranque
+import importlib
+import json
+import resource
+import subprocess
+import sys
+import time
+
+# lo que app.py importaba arriba de todo antes de separar las páginas
+LIBRERIAS_ANTES = ["pandas", "plotly.express", "geopandas", "folium", "requests", "streamlit_folium"]
+
+TIMEOUT = 600
+
+
+def rss_mb():
+    # pico de memoria residente del proceso (en Linux ru_maxrss viene en KB)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir_hijo(pagina):
+    # corre en el proceso nuevo; con pagina=None mide las librerías de antes
+    import streamlit  # noqa: F401  común a todos los casos, no se cuenta
+    base = rss_mb()
+
+    inicio = time.perf_counter()
+    if pagina is None:
+        for libreria in LIBRERIAS_ANTES:
+            importlib.import_module(libreria)
+        return {"import_ms": (time.perf_counter() - inicio) * 1000, "rss_import_mb": rss_mb() - base}
+
+    import app
+    modulo, _ = app.PAGINAS[pagina]
+    importlib.import_module(modulo)
+    resultado = {"import_ms": (time.perf_counter() - inicio) * 1000, "rss_import_mb": rss_mb() - base}
+
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file("app.py", default_timeout=TIMEOUT)
+    inicio = time.perf_counter()
+    at.run()
+    if pagina != "Inicio":
+        at.sidebar.radio[0].set_value(pagina)
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    resultado["render_ms"] = (time.perf_counter() - inicio) * 1000
+    resultado["rss_total_mb"] = rss_mb()
+    resultado["modulos"] = sorted(m for m in LIBRERIAS_ANTES if m in sys.modules)
+    return resultado
+
+
+def medir(pagina):
+    argumentos = [sys.executable, "-m", "benchmarks.arranque", "--hijo"]
+    if pagina is not None:
+        argumentos.append(pagina)
+    salida = subprocess.run(argumentos, capture_output=True, text=True, check=True, timeout=TIMEOUT)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    sys.path.insert(0, ".")
+    import app
+
+    antes = medir(None)
+    print(f"librerías de antes: {antes['import_ms']:.0f} ms, +{antes['rss_import_mb']:.0f} MB en cada arranque\n")
+
+    print(f"{'página':<58} {'import (ms)':>11} {'+RSS (MB)':>10} {'1er render (ms)':>16} "
+          f"{'RSS total (MB)':>15}  librerías cargadas")
+    for pagina in app.PAGINAS:
+        r = medir(pagina)
+        print(f"{pagina:<58} {r['import_ms']:>11.0f} {r['rss_import_mb']:>10.0f} {r['render_ms']:>16.0f} "
+              f"{r['rss_total_mb']:>15.0f}  {', '.join(r['modulos']) or '-'}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--hijo":
+        sys.path.insert(0, ".")
+        print(json.dumps(medir_hijo(sys.argv[2] if len(sys.argv) > 2 else None)))
+    else:
+        main()
@@ -0,0 +1,61 @@
+# bytes de imágenes que recibe el navegador por vista de cada página, con los png
+# originales (tal como los procesa st.image) y con las variantes por ancho del bundle.
+# Uso, desde la raíz del repositorio: python -m benchmarks.bytes_por_pagina
+from collections import defaultdict
+
+from streamlit.elements.image import (WidthBehaviour, _ensure_image_size_and_format,
+                                      _validate_image_format_string)
+
+from imagenes import ANCHO_MOVIL, ancho_escritorio, catalogo_imagenes, imagen
+
+
+# mismas proporciones de columna que usan las páginas en cada llamada a mostrar_imagen
+def fraccion(pagina, indicador):
+    if pagina == "general":
+        return 10 / 12
+    if pagina == "provincia":
+        return 5 / 7
+    if pagina == "beneficios":
+        return 0.7 / 1.7 if indicador.endswith("torta") else 1 / 1.7
+    return 0.5 * 2 / 2.2 if indicador.endswith("torta") else 0.5
+
+
+# las imágenes que se ven juntas en una misma vista de la página
+def vista(pagina, indicador, tipo, nivel, anio):
+    if pagina == "infraestructura":
+        return indicador.split("_")[0], tipo, anio
+    if pagina == "general":
+        return anio
+    return tipo, nivel, anio
+
+
+# lo que st.image termina enviando: redimensiona a 1460 px y recodifica si hace falta
+def enviado(contenido):
+    contenido = bytes(contenido)
+    formato = _validate_image_format_string(contenido, "auto")
+    return len(_ensure_image_size_and_format(contenido, WidthBehaviour.AUTO, formato))
+
+
+def main():
+    antes = defaultdict(lambda: defaultdict(int))
+    escritorio = defaultdict(lambda: defaultdict(int))
+    movil = defaultdict(lambda: defaultdict(int))
+
+    for clave, ruta in catalogo_imagenes().items():
+        if imagen(*clave) is None:
+            continue
+        pagina, indicador = clave[:2]
+        with open(ruta, "rb") as f:
+            antes[pagina][vista(*clave)] += enviado(f.read())
+        escritorio[pagina][vista(*clave)] += enviado(imagen(*clave, ancho_escritorio(fraccion(pagina, indicador))))
+        movil[pagina][vista(*clave)] += enviado(imagen(*clave, ANCHO_MOVIL))
+
+    print(f"{'página':<16} {'vistas':>6} {'antes (KB)':>11} {'escritorio (KB)':>16} {'celular (KB)':>13}")
+    for pagina, vistas in antes.items():
+        promedio = lambda bytes_por_vista: sum(bytes_por_vista.values()) / len(bytes_por_vista) / 1024
+        print(f"{pagina:<16} {len(vistas):>6} {promedio(vistas):>11.1f} "
+              f"{promedio(escritorio[pagina]):>16.1f} {promedio(movil[pagina]):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+# prueba de carga contra `streamlit run app.py` levantado en un puerto local:
+# N sesiones simultáneas hablan con el servidor por el mismo websocket y con
+# los mismos mensajes protobuf que el navegador, siguiendo un recorrido de
+# usuario (cambiar de página, cambiar el año, hacer click en provincias del
+# mapa) con pausas entre acciones. Para cada nivel de concurrencia informa
+# reruns por segundo, latencia p50/p99 de cada tipo de acción (desde que se
+# envía el cambio hasta que termina el rerun) y CPU y memoria del servidor.
+# CPU y memoria se leen de /proc, así que sólo se informan en Linux.
+# Uso, desde la raíz del repositorio:
+#   python -m benchmarks.carga --sesiones 1,5,10,25 --duracion 30
+#   python -m benchmarks.carga --salida carga.json --linea-base carga_anterior.json
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+from app import PAGINAS
+from datos import ANIOS
+from mapa import GEOJSON_PROVINCIAS
+
+PAGINA_MAPA = "Estudiantes Extranjeros por Provincia"
+# páginas con selectores a las que se pasa entre visita y visita al mapa
+PAGINAS_VISITADAS = ["Distribución de Nacionalidades Extranjeras en Argentina", "Beneficios Alimenticios Gratuitos",
+                     "Infraestructuras Escolares Esenciales", "Sectores Público y Privado"]
+
+ETIQUETA_MENU = "Selecciona una página:"
+ETIQUETA_ANIO = "Selecciona el año:"
+
+TIMEOUT_RERUN = 120
+TIMEOUT_ARRANQUE = 60
+# el geojson del mapa viaja dentro del mensaje del componente
+TAMANIO_MAXIMO_MENSAJE = 64 * 1024 * 1024
+INTERVALO_MUESTREO = 0.5
+
+
+def provincias_mapa():
+    # los nombres que devuelve el mapa al hacer click: la propiedad `nombre`
+    # de cada provincia del geojson que dibuja la app
+    with open(GEOJSON_PROVINCIAS) as f:
+        return sorted(feature["properties"]["nombre"] for feature in json.load(f)["features"])
+
+
+class Sesion:
+    # una pestaña del navegador: guarda los widgets que dibujó el último rerun
+    # y su valor, que se reenvían completos en cada rerun como hace el frontend
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.widgets = {}
+        self.valores = {}
+        self.mensajes = {}
+        self.errores = 0
+
+    async def conectar(self):
+        self.ws = await websocket_connect(self.url, max_message_size=TAMANIO_MAXIMO_MENSAJE)
+
+    def cerrar(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, fragmento=""):
+        if not fragmento:
+            self.widgets = {}
+
+        estado = BackMsg()
+        estado.rerun_script.query_string = ""
+        estado.rerun_script.fragment_id = fragmento
+        for id_widget, valor in self.valores.items():
+            widget = estado.rerun_script.widget_states.widgets.add(id=id_widget)
+            if isinstance(valor, str):
+                widget.json_value = valor
+            else:
+                widget.int_value = valor
+        await self.ws.write_message(estado.SerializeToString(), binary=True)
+
+        while True:
+            datos = await asyncio.wait_for(self.ws.read_message(), TIMEOUT_RERUN)
+            if datos is None:
+                raise ConnectionError("el servidor cerró el websocket")
+            msg = ForwardMsg.FromString(datos)
+            tipo = msg.WhichOneof("type")
+            if tipo == "ref_hash":
+                # mensaje que el servidor ya había mandado en esta sesión
+                msg = self.mensajes[msg.ref_hash]
+                tipo = msg.WhichOneof("type")
+            elif msg.metadata.cacheable:
+                self.mensajes[msg.hash] = msg
+
+            if tipo == "delta":
+                self.registrar(msg)
+            elif tipo == "script_finished":
+                if msg.script_finished in (ForwardMsg.FINISHED_SUCCESSFULLY,
+                                           ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY):
+                    break
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("app.py no compila")
+
+        # los widgets que ya no están se dejan de enviar, como en el navegador
+        self.valores = {id_widget: valor for id_widget, valor in self.valores.items() if id_widget in self.widgets}
+
+    def registrar(self, msg):
+        if msg.delta.WhichOneof("type") != "new_element":
+            return
+        elemento = msg.delta.new_element
+        tipo = elemento.WhichOneof("type")
+        if tipo == "exception":
+            self.errores += 1
+        elif tipo in ("radio", "selectbox"):
+            widget = getattr(elemento, tipo)
+            self.widgets[widget.id] = {"tipo": tipo, "etiqueta": widget.label, "opciones": list(widget.options)}
+            self.valores.setdefault(widget.id, widget.default)
+        elif tipo == "component_instance":
+            self.widgets[elemento.component_instance.id] = {"tipo": "componente",
+                                                          "nombre": elemento.component_instance.component_name,
+                                                          "fragmento": msg.delta.fragment_id}
+
+    def buscar(self, tipo, etiqueta=None):
+        for id_widget, widget in self.widgets.items():
+            if widget["tipo"] == tipo and (etiqueta is None or widget.get("etiqueta") == etiqueta):
+                return id_widget, widget
+        return None, None
+
+    async def elegir(self, etiqueta, opcion):
+        id_widget, widget = self.buscar("selectbox", etiqueta)
+        if id_widget is None:
+            id_widget, widget = self.buscar("radio", etiqueta)
+        self.valores[id_widget] = widget["opciones"].index(str(opcion))
+        await self.rerun()
+
+    async def clic_mapa(self, prov):
+        # lo que devuelve st_folium al hacer click sobre una provincia
+        id_widget, widget = self.buscar("componente")
+        self.valores[id_widget] = json.dumps({"last_active_drawing": {"properties": {"nombre": prov}}})
+        await self.rerun(widget["fragmento"])
+
+
+class Medicion:
+
+    def __init__(self):
+        self.latencias = {}
+        self.errores = 0
+
+    async def medir(self, accion, corrutina):
+        inicio = time.perf_counter()
+        try:
+            await corrutina
+        except (ConnectionError, RuntimeError, asyncio.TimeoutError, KeyError, ValueError):
+            self.errores += 1
+            raise
+        self.latencias.setdefault(accion, []).append((time.perf_counter() - inicio) * 1000)
+
+
+async def usuario(url, medicion, fin, pausa, rng, provincias):
+    # recorrido de un/a visitante: entra, va al mapa, cambia el año y hace click
+    # en algunas provincias, pasa por otra página y vuelve al mapa
+    sesion = Sesion(url)
+
+    async def pensar():
+        await asyncio.sleep(rng.uniform(*pausa))
+        return time.perf_counter() < fin
+
+    try:
+        await sesion.conectar()
+        await medicion.medir("entrada", sesion.rerun())
+        while await pensar():
+            await medicion.medir("pagina", sesion.elegir(ETIQUETA_MENU, PAGINA_MAPA))
+            for _ in range(rng.randint(1, 3)):
+                if not await pensar():
+                    return
+                await medicion.medir("anio", sesion.elegir(ETIQUETA_ANIO, rng.choice(ANIOS)))
+                for _ in range(rng.randint(1, 4)):
+                    if not await pensar():
+                        return
+                    await medicion.medir("clic", sesion.clic_mapa(rng.choice(provincias)))
+            if not await pensar():
+                return
+            await medicion.medir("pagina", sesion.elegir(ETIQUETA_MENU, rng.choice(PAGINAS_VISITADAS)))
+            if not await pensar():
+                return
+            await medicion.medir("anio", sesion.elegir(ETIQUETA_ANIO, rng.choice(ANIOS)))
+    except (ConnectionError, RuntimeError, asyncio.TimeoutError, KeyError, ValueError) as error:
+        print(f"  sesión abortada: {error!r}", file=sys.stderr)
+    finally:
+        medicion.errores += sesion.errores
+        sesion.cerrar()
+
+
+def cpu_segundos(pid):
+    # utime + stime del proceso, en segundos
+    with open(f"/proc/{pid}/stat") as f:
+        campos = f.read().rsplit(")", 1)[1].split()
+    return (int(campos[11]) + int(campos[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for linea in f:
+            if linea.startswith("VmRSS:"):
+                return int(linea.split()[1]) / 1024
+    return None
+
+
+async def muestrear(pid, muestras, fin):
+    while time.perf_counter() < fin:
+        muestras.append(rss_mb(pid))
+        await asyncio.sleep(INTERVALO_MUESTREO)
+
+
+def percentil(valores, p):
+    if len(valores) < 2:
+        return valores[0] if valores else None
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+
+def resumir(latencias):
+    return {"reruns": len(latencias), "p50_ms": round(percentil(latencias, 50), 1),
+            "p99_ms": round(percentil(latencias, 99), 1)}
+
+
+async def nivel(url, pid, sesiones, duracion, pausa, semilla):
+    provincias = provincias_mapa()
+    medicion = Medicion()
+    muestras = []
+    linux = pid is not None and os.path.exists(f"/proc/{pid}/stat")
+
+    cpu_inicio = cpu_segundos(pid) if linux else None
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    tareas = [usuario(url, medicion, fin, pausa, random.Random(semilla + i), provincias) for i in range(sesiones)]
+    if linux:
+        tareas.append(muestrear(pid, muestras, fin))
+    await asyncio.gather(*tareas)
+    transcurrido = time.perf_counter() - inicio
+
+    todas = [latencia for latencias in medicion.latencias.values() for latencia in latencias]
+    resultado = {
+        "sesiones": sesiones,
+        "segundos": round(transcurrido, 1),
+        "reruns_por_segundo": round(len(todas) / transcurrido, 2),
+        "errores": medicion.errores,
+        **(resumir(todas) if todas else {"reruns": 0}),
+        "acciones": {accion: resumir(latencias) for accion, latencias in sorted(medicion.latencias.items())},
+        "cpu_servidor_pct": round((cpu_segundos(pid) - cpu_inicio) / transcurrido * 100, 1) if linux else None,
+        "rss_servidor_max_mb": round(max(muestras), 1) if muestras else None,
+    }
+    return resultado
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def levantar_servidor(puerto, carpeta):
+    # el buzón de contacto que abre la app al arrancar va a una base vacía en
+    # `carpeta` y a una URL local: la prueba no toca buzon_contacto.sqlite3 ni
+    # manda sus mensajes pendientes a FormSubmit
+    entorno = dict(os.environ, BUZON_CONTACTO=os.path.join(carpeta, "buzon.sqlite3"),
+                   URL_CONTACTO="http://127.0.0.1:9/")
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(puerto), "--server.address", "127.0.0.1", "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=entorno)
+    limite = time.perf_counter() + TIMEOUT_ARRANQUE
+    while time.perf_counter() < limite:
+        if servidor.poll() is not None:
+            raise RuntimeError("streamlit run app.py terminó al arrancar")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=1) as respuesta:
+                if respuesta.status == 200:
+                    return servidor
+        except OSError:
+            time.sleep(0.2)
+    servidor.terminate()
+    raise RuntimeError(f"el servidor no respondió en {TIMEOUT_ARRANQUE} s")
+
+
+async def calentar(url):
+    # un recorrido completo por todas las páginas: el primer rerun de cada una
+    # llena los caches del proceso y no es representativo de la carga
+    sesion = Sesion(url)
+    await sesion.conectar()
+    try:
+        await sesion.rerun()
+        for pagina in PAGINAS:
+            if pagina != "Contacto":
+                await sesion.elegir(ETIQUETA_MENU, pagina)
+        for year in ANIOS:
+            await sesion.elegir(ETIQUETA_MENU, PAGINA_MAPA)
+            await sesion.elegir(ETIQUETA_ANIO, year)
+    finally:
+        sesion.cerrar()
+
+
+def comparar(niveles, linea_base, umbral):
+    anteriores = {anterior["sesiones"]: anterior for anterior in linea_base}
+    regresiones = []
+    for actual in niveles:
+        anterior = anteriores.get(actual["sesiones"])
+        if anterior is None or not actual.get("reruns") or not anterior.get("reruns"):
+            continue
+        if actual["p99_ms"] > anterior["p99_ms"] * (1 + umbral):
+            regresiones.append((actual["sesiones"], "p99_ms", anterior["p99_ms"], actual["p99_ms"]))
+        if actual["reruns_por_segundo"] < anterior["reruns_por_segundo"] * (1 - umbral):
+            regresiones.append((actual["sesiones"], "reruns_por_segundo",
+                                anterior["reruns_por_segundo"], actual["reruns_por_segundo"]))
+    return regresiones
+
+
+def imprimir(resultado):
+    def ms(valor):
+        return f"{valor:8.0f}" if valor is not None else f"{'-':>8}"
+
+    cpu = resultado["cpu_servidor_pct"]
+    rss = resultado["rss_servidor_max_mb"]
+    print(f"{resultado['sesiones']:8d} {resultado['reruns_por_segundo']:10.2f} {ms(resultado.get('p50_ms'))} "
+          f"{ms(resultado.get('p99_ms'))} {ms(resultado['acciones'].get('clic', {}).get('p99_ms'))} "
+          f"{cpu if cpu is not None else '-':>8} {rss if rss is not None else '-':>8} {resultado['errores']:7d}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sesiones", default="1,5,10,25",
+                        help="niveles de concurrencia, separados por coma")
+    parser.add_argument("--duracion", type=float, default=30, help="segundos por nivel")
+    parser.add_argument("--pausa", type=float, nargs=2, default=[0.5, 2.0], metavar=("MIN", "MAX"),
+                        help="segundos que cada sesión espera entre acciones")
+    parser.add_argument("--puerto", type=int, help="puerto del servidor (por defecto, uno libre)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON donde se guardan los resultados")
+    parser.add_argument("--linea-base", help="resultados anteriores contra los que comparar")
+    parser.add_argument("--umbral", type=float, default=0.25,
+                        help="empeoramiento relativo tolerado antes de marcar una regresión (0.25 = 25%%)")
+    parser.add_argument("--p99-clic-max", type=float, default=1000,
+                        help="p99 de click en el mapa (ms) por encima del cual se considera que el servidor no da abasto")
+    args = parser.parse_args()
+
+    niveles = [int(n) for n in args.sesiones.split(",")]
+    puerto = args.puerto or puerto_libre()
+    url = f"ws://127.0.0.1:{puerto}/_stcore/stream"
+
+    carpeta = tempfile.TemporaryDirectory()
+    servidor = levantar_servidor(puerto, carpeta.name)
+    resultados = []
+    try:
+        inicio = time.perf_counter()
+        asyncio.run(calentar(url))
+        print(f"calentamiento: {time.perf_counter() - inicio:.1f} s, "
+              f"servidor con {rss_mb(servidor.pid) or 0:.0f} MB", file=sys.stderr)
+
+        print(f"{'sesiones':>8} {'reruns/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'clic p99':>8} "
+              f"{'CPU %':>8} {'RSS MB':>8} {'errores':>7}")
+        for sesiones in niveles:
+            resultado = asyncio.run(nivel(url, servidor.pid, sesiones, args.duracion, tuple(args.pausa),
+                                          args.semilla))
+            resultados.append(resultado)
+            imprimir(resultado)
+    finally:
+        servidor.terminate()
+        servidor.wait()
+        carpeta.cleanup()
+
+    soportados = [r["sesiones"] for r in resultados
+                  if r["acciones"].get("clic") and r["acciones"]["clic"]["p99_ms"] <= args.p99_clic_max
+                  and not r["errores"]]
+    if soportados:
+        print(f"hasta {max(soportados)} sesiones con p99 de click en el mapa <= {args.p99_clic_max:.0f} ms")
+    else:
+        print(f"ningún nivel con p99 de click en el mapa <= {args.p99_clic_max:.0f} ms")
+
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "cpus": os.cpu_count(),
+                "duracion": args.duracion,
+                "pausa": args.pausa,
+                "niveles": resultados,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"{len(resultados)} niveles guardados en {args.salida}")
+
+    if args.linea_base:
+        with open(args.linea_base) as f:
+            linea_base = json.load(f)["niveles"]
+        regresiones = comparar(resultados, linea_base, args.umbral)
+        for sesiones, medida, anterior, actual in regresiones:
+            print(f"REGRESIÓN {medida} con {sesiones} sesiones: {anterior} -> {actual}")
+        if regresiones:
+            sys.exit(1)
+        print(f"Sin regresiones mayores al {args.umbral:.0%} respecto de {args.linea_base}")
+
+
+if __name__ == "__main__":
+    main()
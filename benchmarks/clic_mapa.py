@@ -0,0 +1,85 @@
+# CPU del servidor por click en el mapa de provincias, contra `streamlit run
+# app.py` y por el mismo websocket que el navegador (las sesiones de
+# benchmarks/carga.py). El click se manda como lo manda el navegador: un rerun
+# con el fragment_id del componente, que sólo vuelve a ejecutar el fragmento con
+# el mapa y las métricas. Como referencia, el mismo click con un rerun completo
+# del script, que es lo que pasaba antes de @st.fragment: la diferencia es lo
+# que cuesta el resto de la página, que con los caches llenos es poco. La CPU
+# se lee de /proc, así que sólo se informa en Linux.
+# Uso, desde la raíz del repositorio: python -m benchmarks.clic_mapa
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.carga import (ETIQUETA_ANIO, ETIQUETA_MENU, PAGINA_MAPA, Sesion, cpu_segundos, levantar_servidor,
+                              provincias_mapa, puerto_libre)
+
+ANIO = 2015
+REPETICIONES = 30
+
+
+async def clics(sesion, provincias, fragmento, pid):
+    id_widget, widget = sesion.buscar("componente")
+    if fragmento and not widget["fragmento"]:
+        raise RuntimeError("el mapa no está dentro de un fragmento")
+
+    latencias = []
+    cpu_inicio = cpu_segundos(pid) if pid is not None else None
+    for i in range(REPETICIONES):
+        # lo que devuelve st_folium al hacer click sobre una provincia
+        prov = provincias[i % len(provincias)]
+        sesion.valores[id_widget] = json.dumps({"last_active_drawing": {"properties": {"nombre": prov}}})
+        inicio = time.perf_counter()
+        await sesion.rerun(widget["fragmento"] if fragmento else "")
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        id_widget, widget = sesion.buscar("componente")
+    cpu = (cpu_segundos(pid) - cpu_inicio) / REPETICIONES * 1000 if pid is not None else None
+    return cpu, statistics.median(latencias)
+
+
+async def medir(url, pid):
+    sesion = Sesion(url)
+    await sesion.conectar()
+    try:
+        await sesion.rerun()
+        await sesion.elegir(ETIQUETA_MENU, PAGINA_MAPA)
+        await sesion.elegir(ETIQUETA_ANIO, ANIO)
+        provincias = provincias_mapa()
+        await clics(sesion, provincias, True, None)  # calentamiento: llena los caches del proceso
+
+        resultados = {}
+        for nombre, fragmento in (("rerun completo", False), ("rerun del fragmento", True)):
+            resultados[nombre] = await clics(sesion, provincias, fragmento, pid)
+        if sesion.errores:
+            raise RuntimeError(f"{sesion.errores} excepciones en la app")
+        return resultados
+    finally:
+        sesion.cerrar()
+
+
+def main():
+    sys.path.insert(0, ".")
+
+    puerto = puerto_libre()
+    carpeta = tempfile.TemporaryDirectory()
+    servidor = levantar_servidor(puerto, carpeta.name)
+    try:
+        pid = servidor.pid if os.path.exists(f"/proc/{servidor.pid}/stat") else None
+        resultados = asyncio.run(medir(f"ws://127.0.0.1:{puerto}/_stcore/stream", pid))
+    finally:
+        servidor.terminate()
+        servidor.wait()
+        carpeta.cleanup()
+
+    print(f"{'':<22}{'CPU (ms)':>10}{'latencia p50 (ms)':>19}")
+    for nombre, (cpu, latencia) in resultados.items():
+        cpu = f"{cpu:.1f}" if cpu is not None else "-"
+        print(f"{nombre + ':':<22}{cpu:>10}{latencia:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
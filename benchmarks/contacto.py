@@ -0,0 +1,94 @@
+# el formulario de contacto contra un servidor HTTP local que responde bien o
+# lento: cuánto espera el script de la página al enviar (antes, requests.post
+# directo; ahora, el buzón). Lo que termina entregando el buzón (reintentos,
+# duplicados, reinicio de la app) se prueba en tests/test_buzon.py, que usa el
+# mismo servidor local.
+# Uso, desde la raíz del repositorio: python -m benchmarks.contacto
+import contextlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+DEMORA_LENTO = 3
+TIMEOUT = (0.5, 1)
+
+
+@contextlib.contextmanager
+def servidor_stub(respuestas, demora=0):
+    # respuestas: códigos HTTP que se devuelven en orden (el último se repite)
+    recibidos = []
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            recibidos.append(time.perf_counter())
+            time.sleep(demora)
+            codigo = respuestas[min(len(recibidos), len(respuestas)) - 1]
+            self.send_response(codigo)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    try:
+        yield f"http://127.0.0.1:{servidor.server_address[1]}/", recibidos
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def mensaje(i):
+    return {"name": f"Persona {i}", "email": f"persona{i}@example.com", "message": "Mensaje de prueba"}
+
+
+def esperar(condicion, limite):
+    fin = time.perf_counter() + limite
+    while not condicion() and time.perf_counter() < fin:
+        time.sleep(0.02)
+    return condicion()
+
+
+def envio_directo(url):
+    # lo que hacía la página antes: bloquea el rerun hasta que responde el servidor
+    inicio = time.perf_counter()
+    requests.post(url, data=mensaje(0))
+    return (time.perf_counter() - inicio) * 1000
+
+
+def escenario(nombre, demora, mensajes):
+    from buzon import Buzon
+
+    with servidor_stub([200], demora) as (url, recibidos), tempfile.TemporaryDirectory() as carpeta:
+        antes = envio_directo(url)
+
+        buzon = Buzon(os.path.join(carpeta, "buzon.sqlite3"), url, timeout=TIMEOUT)
+        tiempos = []
+        for i in range(mensajes):
+            inicio = time.perf_counter()
+            buzon.encolar(mensaje(i))
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        buzon.detener()
+
+    print(f"{nombre:<28} {antes:>12.1f} {max(tiempos):>14.2f}")
+
+
+def main():
+    sys.path.insert(0, ".")
+
+    print(f"{'servidor':<28} {'antes (ms)':>12} {'encolar (ms)':>14}")
+    escenario("responde 200", 0, 20)
+    escenario(f"tarda {DEMORA_LENTO} s en responder", DEMORA_LENTO, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# carga de los datos por provincia desde los 13 csv (como antes) y desde el
+# dataset Parquet: tiempo, memoria pico durante la carga, tamaño del DataFrame
+# resultante y tamaño en disco. También una lectura proyectada (una columna, un año).
+# Uso, desde la raíz del repositorio: python -m benchmarks.datos
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+
+from datos import (ANIOS, COLUMNAS_CANTIDAD, COLUMNAS_PORCENTAJE, CSV_EXTRANJEROS, DATASET_EXTRANJEROS,
+                   construir_dataset, dataset_al_dia, leer_dataset)
+
+REPETICIONES = 20
+
+
+def cargar_desde_csv():
+    # el camino anterior: un read_csv por año, con esquemas distintos antes y después de 2014
+    frames = []
+    for year in ANIOS:
+        df = pd.read_csv(CSV_EXTRANJEROS.format(year=year))
+        df.insert(0, "anio", year)
+        frames.append(df)
+
+    data = pd.concat(frames, ignore_index=True)
+    data = data[["anio", "provincia"] + COLUMNAS_CANTIDAD + COLUMNAS_PORCENTAJE]
+    data["anio"] = data["anio"].astype("int16")
+    data["provincia"] = data["provincia"].astype("category")
+    for col in COLUMNAS_CANTIDAD:
+        data[col] = data[col].astype("Int32" if col == "Venezuela" else "int32")
+    return data.set_index(["anio", "provincia"]).sort_index()
+
+
+def tamanio_disco(rutas):
+    return sum(os.path.getsize(ruta) for ruta in rutas)
+
+
+def medir(nombre, funcion, disco):
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        data = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    memoria = data.memory_usage(deep=True).sum() + data.index.memory_usage(deep=True)
+    print(f"{nombre:<34} {min(tiempos) * 1000:>10.2f} {pico / 1024:>11.0f} {memoria / 1024:>12.1f} "
+          f"{disco / 1024:>11.1f}")
+
+
+def main():
+    if not dataset_al_dia():
+        construir_dataset()
+
+    csvs = [CSV_EXTRANJEROS.format(year=year) for year in ANIOS]
+    parquets = [os.path.join(raiz, archivo) for raiz, _, archivos in os.walk(DATASET_EXTRANJEROS)
+                for archivo in archivos]
+
+    print(f"{'lectura':<34} {'tiempo (ms)':>10} {'pico (KB)':>11} {'DataFrame (KB)':>12} {'disco (KB)':>11}")
+    medir("csv, todo", cargar_desde_csv, tamanio_disco(csvs))
+    medir("parquet, todo", leer_dataset, tamanio_disco(parquets))
+    medir("parquet, porcentaje_Bolivia 2015",
+          lambda: leer_dataset(["porcentaje_Bolivia"], anios=[2015]),
+          tamanio_disco([p for p in parquets if "anio=2015" in p]))
+
+
+if __name__ == "__main__":
+    main()
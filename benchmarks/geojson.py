@@ -0,0 +1,41 @@
+# micro-benchmark del enriquecimiento del geojson de provincias por rerun.
+# Uso, desde la raíz del repositorio: python -m benchmarks.geojson
+import json
+import timeit
+
+import pandas as pd
+
+from datos import ANIOS, CSV_EXTRANJEROS, version_extranjeros
+from mapa import GEOJSON_PROVINCIAS, geojson_anio
+
+REPETICIONES = 50
+
+
+# reproducción del camino anterior: csv + json.load + filtro por provincia
+def geojson_sin_cache(year):
+    data = pd.read_csv(CSV_EXTRANJEROS.format(year=year))
+    with open(GEOJSON_PROVINCIAS, 'r') as f:
+        provincias_geojson = json.load(f)
+
+    for feature in provincias_geojson['features']:
+        row = data[data['provincia'] == feature['properties']['nombre']]
+        if not row.empty:
+            feature['properties'].update({
+                col: float(row[col].iloc[0])
+                for col in row.columns if col.startswith('porcentaje_')
+            })
+    return provincias_geojson
+
+
+def main():
+    print(f"{'año':>6} {'antes (ms)':>12} {'después (ms)':>14}")
+    version = version_extranjeros()
+    for year in ANIOS:
+        geojson_anio(year, version)  # primer armado, fuera de la medición
+        antes = timeit.timeit(lambda: geojson_sin_cache(year), number=REPETICIONES)
+        despues = timeit.timeit(lambda: geojson_anio(year, version), number=REPETICIONES)
+        print(f"{year:>6} {antes / REPETICIONES * 1000:>12.3f} {despues / REPETICIONES * 1000:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# ingesta de microdatos sintéticos (por defecto 13 años x 80.000 escuelas, algo
+# más de un millón de filas): tiempo, filas por segundo, memoria máxima de los
+# procesos y chequeos de que los totales escritos coinciden con los generados.
+# Uso, desde la raíz del repositorio: python -m benchmarks.ingesta [--escuelas 80000]
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from datos import ANIOS, CSV_EXTRANJEROS, NACIONALIDADES, normalizar_extranjeros
+from graficos import AGREGADOS_INDICADORES
+from ingesta import MICRODATOS_ANIO, NIVELES, PRIMER_ANIO_BIBLIOTECA, ingerir
+
+PROVINCIAS = ["Buenos Aires", "Catamarca", "Chaco", "Chubut", "Ciudad de Buenos Aires", "Corrientes", "Córdoba",
+              "Entre Ríos", "Formosa", "Jujuy", "La Pampa", "La Rioja", "Mendoza", "Misiones", "Neuquén",
+              "Río Negro", "Salta", "San Juan", "San Luis", "Santa Cruz", "Santa Fe", "Santiago del Estero",
+              "Tierra del Fuego", "Tucumán"]
+
+FILAS_POR_ESCRITURA = 100_000
+
+
+def generar_anio(ruta, year, escuelas, rng):
+    # devuelve el total de extranjeros/as que debería quedar tras descartar los
+    # niveles inconsistentes
+    esperado = 0
+    for inicio in range(0, escuelas, FILAS_POR_ESCRITURA):
+        n = min(FILAS_POR_ESCRITURA, escuelas - inicio)
+        df = pd.DataFrame({
+            "provincia": rng.choice(PROVINCIAS, n),
+            "sector": rng.choice(["Estatal", "Privado"], n, p=[0.7, 0.3]),
+            "electricidad": rng.choice(["red", "otra", "sin"], n, p=[0.9, 0.05, 0.05]),
+            "internet": rng.choice(["gratuito", "pago", "sin"], n),
+            "biblioteca": rng.choice([1, 0], n).astype(float) if year >= PRIMER_ANIO_BIBLIOTECA else np.nan,
+        })
+        for nivel in NIVELES:
+            # una de cada cinco escuelas no tiene el nivel; algunas igual declaran extranjeros/as
+            matricula = np.where(rng.random(n) < 0.2, 0, rng.integers(20, 800, n))
+            df[f"matricula_{nivel}"] = matricula
+            df[f"comida_{nivel}"] = rng.integers(0, 2, n)
+            extranjeros = np.where(rng.random((n, len(NACIONALIDADES))) < 0.3,
+                                   rng.integers(1, 20, (n, len(NACIONALIDADES))), 0)
+            for i, nacionalidad in enumerate(NACIONALIDADES):
+                df[f"{nacionalidad}_{nivel}"] = extranjeros[:, i]
+            esperado += int(extranjeros[matricula > 0].sum())
+        df.to_csv(ruta, mode="a" if inicio else "w", header=not inicio, index=False)
+    return esperado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escuelas", type=int, default=80_000, help="escuelas por año")
+    parser.add_argument("--bloque", type=int, default=200_000, help="filas leídas por vez")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as carpeta:
+        microdatos = os.path.join(carpeta, "microdatos")
+        salida = os.path.join(carpeta, "salida")
+        os.makedirs(microdatos)
+
+        esperados = {}
+        for year in ANIOS:
+            esperados[year] = generar_anio(os.path.join(microdatos, MICRODATOS_ANIO.format(year=year)),
+                                           year, args.escuelas, rng)
+        filas_total = args.escuelas * len(ANIOS)
+        print(f"{filas_total:,} escuelas sintéticas generadas")
+
+        inicio = time.perf_counter()
+        resumen = ingerir(microdatos, salida, args.bloque)
+        duracion = time.perf_counter() - inicio
+
+        rss_padre = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        rss_hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        print(f"{duracion:.1f} s, {filas_total / duracion:,.0f} escuelas/s, "
+              f"memoria máxima {rss_padre:.0f} MB (proceso principal), {rss_hijos:.0f} MB (proceso de un año)")
+
+        errores = []
+        for year, filas, _ in resumen:
+            data = pd.read_csv(os.path.join(salida, CSV_EXTRANJEROS.format(year=year)))
+            normalizar_extranjeros(data)  # el esquema que espera la app
+            if data["total_extranjeros"].sum() != esperados[year]:
+                errores.append(f"{year}: {data['total_extranjeros'].sum()} extranjeros/as, se esperaban {esperados[year]}")
+            if filas != args.escuelas:
+                errores.append(f"{year}: {filas} escuelas leídas, se esperaban {args.escuelas}")
+
+        for indicador in ["sector", "electricidad", "internet", "biblioteca"]:
+            tabla = pd.read_parquet(os.path.join(salida, AGREGADOS_INDICADORES, f"{indicador}.parquet"))
+            por_anio = tabla.groupby("anio")["escuelas"].sum()
+            anios = [year for year in ANIOS if indicador != "biblioteca" or year >= PRIMER_ANIO_BIBLIOTECA]
+            if list(por_anio.index) != anios or (por_anio != args.escuelas).any():
+                errores.append(f"{indicador}: escuelas por año {por_anio.to_dict()}")
+
+        for error in errores:
+            print("ERROR", error)
+        if errores:
+            print(f"{len(errores)} diferencias")
+            sys.exit(1)
+        print("totales coinciden con los generados")
+
+
+if __name__ == "__main__":
+    main()
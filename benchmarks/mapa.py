@@ -0,0 +1,39 @@
+# tamaño del mapa enviado al navegador y tiempo de render por año, con el
+# geojson original reconstruido en cada rerun y con el camino simplificado/cacheado.
+# Uso, desde la raíz del repositorio: python -m benchmarks.mapa
+import time
+
+from datos import ANIOS, version_extranjeros
+from mapa import construir_mapa, mapa_renderizado, renderizar_mapa
+from benchmarks.geojson import geojson_sin_cache
+
+REPETICIONES = 10
+
+
+def tamanio(renderizado):
+    return len(renderizado['script'].encode()) + len(renderizado['html'].encode())
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        resultado = funcion()
+    return resultado, (time.perf_counter() - inicio) / REPETICIONES * 1000
+
+
+def main():
+    print(f"{'año':>6} {'antes (KB)':>11} {'después (KB)':>13} "
+          f"{'antes (ms)':>11} {'1er render (ms)':>16} {'cacheado (ms)':>14}")
+    version = version_extranjeros()
+    for year in ANIOS:
+        antes, t_antes = medir(lambda: renderizar_mapa(construir_mapa(year, geojson_sin_cache(year))))
+        inicio = time.perf_counter()
+        despues = mapa_renderizado(year, version)
+        t_primero = (time.perf_counter() - inicio) * 1000
+        _, t_cache = medir(lambda: mapa_renderizado(year, version))
+        print(f"{year:>6} {tamanio(antes) / 1024:>11.1f} {tamanio(despues) / 1024:>13.1f} "
+              f"{t_antes:>11.2f} {t_primero:>16.2f} {t_cache:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# tiempo y memoria pico de cada rerun de app.py, para cada página del menú y
+# cada combinación de sus selectores, sin navegador ni red (AppTest).
+# Uso, desde la raíz del repositorio:
+#   python -m benchmarks.paginas --salida resultados.json
+#   python -m benchmarks.paginas --linea-base resultados.json --umbral 0.25
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.contacto import servidor_stub
+
+TIMEOUT = 600
+
+
+def medir(at, repeticiones):
+    # el mínimo de varios reruns: una sola medición (o la mediana, con pocas
+    # repeticiones) queda a merced de lo que haga el resto de la máquina
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        at.run()
+        tiempos.append(time.perf_counter() - inicio)
+    tiempo = min(tiempos)
+
+    # la memoria se mide en una segunda pasada: tracemalloc infla los tiempos
+    tracemalloc.start()
+    at.run()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {"tiempo_ms": round(tiempo * 1000, 2), "memoria_pico_kb": round(pico / 1024, 1)}
+
+
+def casos(at, pagina):
+    # deja cargada en `at` cada combinación de los radios del cuerpo de la página
+    # y, para cada una, de todas las opciones de sus selectbox; devuelve su nombre
+    radios = [(radio.label, radio.options) for radio in at.main.radio]
+    for valores_radio in itertools.product(*[range(len(opciones)) for _, opciones in radios]):
+        for i, indice in enumerate(valores_radio):
+            at.main.radio[i].set_value(radios[i][1][indice])
+        at.run()
+
+        selectores = [(sb.label, sb.options) for sb in at.selectbox]
+        for valores in itertools.product(*[range(len(opciones)) for _, opciones in selectores]):
+            for i, indice in enumerate(valores):
+                at.selectbox[i].select_index(indice)
+            partes = [pagina]
+            partes += [f"{label} {opciones[i]}" for (label, opciones), i in zip(radios, valores_radio)]
+            partes += [f"{label} {opciones[i]}" for (label, opciones), i in zip(selectores, valores)]
+            yield " | ".join(partes)
+
+
+def medir_paginas(repeticiones):
+    from buzon import buzon_proceso
+
+    # el buzón de contacto que abre la app al arrancar usa una base temporal y
+    # un servidor local en lugar de buzon_contacto.sqlite3 y FormSubmit
+    with servidor_stub([200]) as (url, _), tempfile.TemporaryDirectory() as carpeta, \
+            mock.patch.dict(os.environ, {"URL_CONTACTO": url,
+                                         "BUZON_CONTACTO": os.path.join(carpeta, "buzon.sqlite3")}):
+        at = AppTest.from_file("app.py", default_timeout=TIMEOUT)
+        at.run()  # primer arranque: llena los caches del proceso
+
+        resultados = {}
+        for pagina in at.sidebar.radio[0].options:
+            at.sidebar.radio[0].set_value(pagina)
+            at.run()
+
+            if pagina == "Contacto":
+                resultados.update(medir_contacto(at, repeticiones))
+                continue
+
+            for caso in casos(at, pagina):
+                resultados[caso] = medir(at, repeticiones)
+                print(f"{resultados[caso]['tiempo_ms']:9.1f} ms  {caso}", file=sys.stderr)
+
+        # el buzón se creó dentro del directorio temporal: se descarta con él
+        buzon_proceso().detener()
+        buzon_proceso.clear()
+    return resultados
+
+
+def medir_contacto(at, repeticiones):
+    resultados = {"Contacto": medir(at, repeticiones)}
+
+    # el envío del formulario: la página sólo lo deja en el buzón, que el hilo
+    # de fondo entrega al servidor local
+    at.text_input[0].input("Nombre")
+    at.text_input[1].input("correo@example.com")
+    at.text_area[0].input("Mensaje de prueba")
+    at.button[0].click()
+    inicio = time.perf_counter()
+    at.run()
+    if not at.success:
+        raise RuntimeError("el formulario de contacto no confirmó el envío")
+    resultados["Contacto | Enviar"] = {
+        "tiempo_ms": round((time.perf_counter() - inicio) * 1000, 2),
+        "memoria_pico_kb": None,
+    }
+    return resultados
+
+
+def comparar(resultados, linea_base, umbral, minimo_ms):
+    regresiones = []
+    for caso, actual in resultados.items():
+        anterior = linea_base.get(caso)
+        if anterior is None:
+            continue
+        for medida in ("tiempo_ms", "memoria_pico_kb"):
+            if actual[medida] is None or anterior[medida] is None:
+                continue
+            if medida == "tiempo_ms" and actual[medida] - anterior[medida] < minimo_ms:
+                continue
+            if actual[medida] > anterior[medida] * (1 + umbral):
+                regresiones.append((caso, medida, anterior[medida], actual[medida]))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--salida", default="benchmark_paginas.json",
+                        help="archivo JSON donde se guardan los resultados")
+    parser.add_argument("--linea-base", help="resultados anteriores contra los que comparar")
+    parser.add_argument("--umbral", type=float, default=0.25,
+                        help="aumento relativo tolerado antes de marcar una regresión (0.25 = 25%%)")
+    parser.add_argument("--minimo-ms", type=float, default=15,
+                        help="diferencia de tiempo por debajo de la cual no se marca regresión (ruido)")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="reruns por caso; se guarda el menor tiempo")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ".")
+    resultados = medir_paginas(args.repeticiones)
+
+    with open(args.salida, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "casos": resultados,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"{len(resultados)} casos guardados en {args.salida}")
+
+    if args.linea_base:
+        with open(args.linea_base) as f:
+            linea_base = json.load(f)["casos"]
+        regresiones = comparar(resultados, linea_base, args.umbral, args.minimo_ms)
+        for caso, medida, anterior, actual in regresiones:
+            print(f"REGRESIÓN {medida}: {caso}: {anterior} -> {actual}")
+        if regresiones:
+            sys.exit(1)
+        print(f"Sin regresiones mayores al {args.umbral:.0%} respecto de {args.linea_base}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+FORMSUBMIT_URL = "https://formsubmit.co/angeles.carrara@mi.unc.edu.ar"
+
+# los mensajes del formulario se guardan acá antes de enviarse: si el servidor
+# se reinicia con mensajes pendientes, se envían en el próximo arranque
+BUZON_CONTACTO = "buzon_contacto.sqlite3"
+
+# (conexión, lectura) en segundos
+TIMEOUT_ENVIO = (3.05, 10)
+# espera antes del reintento n: ESPERA_INICIAL * 2**(n-1), con jitter y un tope.
+# No hay un máximo de intentos: un mensaje se sigue reintentando cada
+# ESPERA_MAXIMA hasta que el servicio vuelva, por largo que sea el corte
+ESPERA_INICIAL = 5
+ESPERA_MAXIMA = 30 * 60
+# el mismo mensaje dentro de este lapso (doble click, rerun) se guarda una sola
+# vez; si se vuelve a mandar más tarde, es un mensaje nuevo
+VENTANA_DUPLICADOS = 10 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def clave_mensaje(datos):
+    return hashlib.sha256(json.dumps(datos, sort_keys=True).encode()).hexdigest()
+
+
+def espera_reintento(intentos, espera_inicial=ESPERA_INICIAL, espera_maxima=ESPERA_MAXIMA):
+    espera = min(espera_inicial * 2 ** (intentos - 1), espera_maxima)
+    return espera * random.uniform(0.5, 1)
+
+
+class Buzon:
+    # cola de mensajes en SQLite + un hilo que los envía en segundo plano. El
+    # script de la página sólo inserta una fila, nunca espera a la red
+
+    def __init__(self, ruta, url, espera_inicial=ESPERA_INICIAL, espera_maxima=ESPERA_MAXIMA,
+                 timeout=TIMEOUT_ENVIO, ventana_duplicados=VENTANA_DUPLICADOS):
+        self.ruta = ruta
+        self.url = url
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.timeout = timeout
+        self.ventana_duplicados = ventana_duplicados
+
+        self._despertar = threading.Event()
+        self._detenido = False
+        self._lock = threading.Lock()
+
+        with self._conectar() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS mensajes (
+                    id INTEGER PRIMARY KEY,
+                    clave TEXT NOT NULL,
+                    datos TEXT NOT NULL,
+                    creado REAL NOT NULL,
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    proximo_intento REAL NOT NULL,
+                    enviado REAL,
+                    ultimo_error TEXT
+                )
+            """)
+            conexion.execute("CREATE INDEX IF NOT EXISTS mensajes_clave ON mensajes (clave, creado)")
+
+        self._hilo = None
+        self.asegurar_hilo()
+
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta, timeout=30, isolation_level=None)
+        conexion.row_factory = sqlite3.Row
+        return conexion
+
+    def encolar(self, datos):
+        # devuelve False si el mismo mensaje se había encolado hace menos de
+        # ventana_duplicados segundos. Una sola sentencia: la consulta y la
+        # inserción no se intercalan con las de otra sesión
+        ahora = time.time()
+        clave = clave_mensaje(datos)
+        with self._conectar() as conexion:
+            cursor = conexion.execute(
+                "INSERT INTO mensajes (clave, datos, creado, proximo_intento) SELECT ?, ?, ?, ?"
+                " WHERE NOT EXISTS (SELECT 1 FROM mensajes WHERE clave = ? AND creado > ?)",
+                (clave, json.dumps(datos, ensure_ascii=False), ahora, ahora, clave, ahora - self.ventana_duplicados),
+            )
+        nuevo = cursor.rowcount == 1
+        if nuevo:
+            self._despertar.set()
+        return nuevo
+
+    def estado(self):
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                "SELECT COUNT(enviado) AS enviados, SUM(enviado IS NULL) AS pendientes,"
+                " MAX(CASE WHEN enviado IS NULL THEN intentos END) AS intentos"
+                " FROM mensajes"
+            ).fetchone()
+        return {k: fila[k] or 0 for k in ("enviados", "pendientes", "intentos")}
+
+    def asegurar_hilo(self):
+        # _repartir no deja escapar errores, pero si el hilo igual muriera nadie
+        # más lo volvería a crear: el buzón es uno por proceso y queda en cache
+        with self._lock:
+            if self._detenido or (self._hilo is not None and self._hilo.is_alive()):
+                return
+            if self._hilo is not None:
+                logger.error("el hilo del buzón de contacto terminó; se vuelve a iniciar")
+            self._hilo = threading.Thread(target=self._repartir, name="buzon_contacto", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        self._detenido = True
+        self._despertar.set()
+        self._hilo.join()
+
+    def _repartir(self):
+        # requests se importa acá y no arriba: el buzón se crea al arrancar la
+        # app y la página de inicio no tiene que esperar a que cargue
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # una sola conexión HTTP reutilizada entre envíos
+        self._sesion = requests.Session()
+        self._sesion.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self._sesion.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+        conexion = None
+        fallas = 0
+        while not self._detenido:
+            # un error de la base (archivo bloqueado, disco lleno) no puede
+            # terminar el hilo: se registra y se vuelve a probar más tarde, con
+            # la misma espera creciente que los envíos
+            try:
+                if conexion is None:
+                    conexion = self._conectar()
+                self._repartir_siguiente(conexion)
+                fallas = 0
+            except Exception:
+                fallas += 1
+                espera = espera_reintento(fallas, self.espera_inicial, self.espera_maxima)
+                logger.exception("error en el buzón de contacto; se reintenta en %.0f s", espera)
+                if conexion is not None:
+                    conexion.close()
+                    conexion = None
+                self._despertar.wait(espera)
+                self._despertar.clear()
+        if conexion is not None:
+            conexion.close()
+        self._sesion.close()
+
+    def _repartir_siguiente(self, conexion):
+        ahora = time.time()
+        fila = conexion.execute(
+            "SELECT id, datos, intentos, proximo_intento FROM mensajes"
+            " WHERE enviado IS NULL ORDER BY proximo_intento LIMIT 1"
+        ).fetchone()
+
+        if fila is None or fila["proximo_intento"] > ahora:
+            espera = None if fila is None else fila["proximo_intento"] - ahora
+            self._despertar.wait(espera)
+            self._despertar.clear()
+            return
+
+        # se reserva el mensaje corriendo su próximo intento; si otro proceso
+        # comparte el buzón y lo tomó primero, la actualización no afecta filas
+        reserva = ahora + sum(self.timeout) + 1
+        cursor = conexion.execute(
+            "UPDATE mensajes SET proximo_intento = ? WHERE id = ? AND proximo_intento = ?",
+            (reserva, fila["id"], fila["proximo_intento"]),
+        )
+        if cursor.rowcount == 1:
+            self._enviar(conexion, fila)
+
+    def _enviar(self, conexion, fila):
+        import requests
+
+        try:
+            datos = json.loads(fila["datos"])
+            respuesta = self._sesion.post(self.url, data=datos, timeout=self.timeout)
+            error = None if respuesta.status_code == 200 else f"HTTP {respuesta.status_code}"
+        except (ValueError, requests.RequestException) as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is None:
+            conexion.execute("UPDATE mensajes SET enviado = ?, ultimo_error = NULL WHERE id = ?",
+                             (time.time(), fila["id"]))
+            return
+
+        intentos = fila["intentos"] + 1
+        proximo = time.time() + espera_reintento(intentos, self.espera_inicial, self.espera_maxima)
+        conexion.execute(
+            "UPDATE mensajes SET intentos = ?, proximo_intento = ?, ultimo_error = ? WHERE id = ?",
+            (intentos, proximo, error, fila["id"]),
+        )
+        logger.warning("no se pudo enviar el mensaje de contacto %d (intento %d): %s",
+                       fila["id"], intentos, error)
+
+
+# un buzón por proceso, creado al arrancar la app (app.main) para que los
+# pendientes de una ejecución anterior se envíen sin esperar a un mensaje nuevo.
+# La URL y la ruta se pueden cambiar por entorno (para probar contra un servidor local)
+@st.cache_resource(show_spinner=False)
+def buzon_proceso():
+    return Buzon(os.environ.get("BUZON_CONTACTO", BUZON_CONTACTO),
+                 os.environ.get("URL_CONTACTO", FORMSUBMIT_URL))
+
+
+def buzon():
+    actual = buzon_proceso()
+    actual.asegurar_hilo()
+    return actual
@@ -0,0 +1,169 @@
+import os
+import tempfile
+
+import streamlit as st
+
+# los años que muestra el tablero: los selectores de las páginas, el dataset,
+# las imágenes y la API salen de acá. ingesta.py rechaza microdatos de otros años
+ANIOS = range(2011, 2024)
+
+CSV_EXTRANJEROS = "extranjeros_por_provincia/porcentaje_extranjeros_por_provincia_{year}.csv"
+
+# los 13 csv convertidos a un único dataset Parquet, una partición por año
+# (anio=2011/, anio=2012/, ...) y el mismo esquema para todos. No se versiona:
+# se genera con `python datos.py` o al arrancar la app si falta o quedó viejo
+DATASET_EXTRANJEROS = "extranjeros_por_provincia/dataset"
+
+COLUMNAS_CANTIDAD = ["total_extranjeros", "Bolivia", "Paraguay", "Perú", "Venezuela", "Otros"]
+COLUMNAS_PORCENTAJE = ["porcentaje_Bolivia", "porcentaje_Paraguay", "porcentaje_Perú",
+                       "porcentaje_Venezuela", "porcentaje_Otros"]
+NACIONALIDADES = ["Bolivia", "Paraguay", "Perú", "Venezuela", "Otros"]
+
+TOTAL_PAIS = "Total del país"
+
+
+# pandas y pyarrow se importan dentro de las funciones: este módulo también lo
+# usa imagenes.py (por ANIOS) y la página de inicio no tiene que cargarlos
+
+def esquema_extranjeros():
+    import pyarrow as pa
+
+    # provincia como diccionario, cantidades en int32 y porcentajes en float64
+    # para mostrarlos tal cual vienen. Hasta 2013 Venezuela no está
+    # discriminada: sus columnas quedan nulas en lugar de faltar
+    return pa.schema(
+        [("provincia", pa.dictionary(pa.int8(), pa.string()))]
+        + [(col, pa.int32()) for col in COLUMNAS_CANTIDAD]
+        + [(col, pa.float64()) for col in COLUMNAS_PORCENTAJE]
+    )
+
+
+def particionado():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([("anio", pa.int16())]), flavor="hive")
+
+
+def particion(year):
+    return os.path.join(DATASET_EXTRANJEROS, f"anio={year}", "part-0.parquet")
+
+
+def leer_extranjeros(year):
+    # lectura de un único año, tal cual viene el csv
+    import pandas as pd
+    return pd.read_csv(CSV_EXTRANJEROS.format(year=year))
+
+
+def normalizar_extranjeros(df):
+    import pyarrow as pa
+
+    esquema = esquema_extranjeros()
+    df = df.reindex(columns=esquema.names).sort_values("provincia")
+    return pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+
+def dataset_al_dia():
+    for year in ANIOS:
+        ruta = particion(year)
+        if not os.path.exists(ruta) or os.path.getmtime(ruta) < os.path.getmtime(CSV_EXTRANJEROS.format(year=year)):
+            return False
+    return True
+
+
+def construir_dataset():
+    import pyarrow.parquet as pq
+
+    for year in ANIOS:
+        ruta = particion(year)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        # la app y api.py pueden reconstruir a la vez: cada uno escribe en su
+        # propio temporal, que empieza con punto para que pyarrow no lo lea
+        # como parte del dataset mientras se escribe
+        temporal = tempfile.NamedTemporaryFile(dir=os.path.dirname(ruta), prefix=".part-", suffix=".tmp",
+                                               delete=False)
+        try:
+            with temporal:
+                pq.write_table(normalizar_extranjeros(leer_extranjeros(year)), temporal)
+            os.replace(temporal.name, ruta)
+        except BaseException:
+            os.remove(temporal.name)
+            raise
+
+
+def leer_dataset(columnas=None, anios=None):
+    # sólo se leen las columnas y los años pedidos, con los archivos mapeados en memoria
+    import pyarrow.parquet as pq
+
+    columnas = COLUMNAS_CANTIDAD + COLUMNAS_PORCENTAJE if columnas is None else list(columnas)
+    filtros = None if anios is None else [("anio", "in", list(anios))]
+    tabla = pq.read_table(DATASET_EXTRANJEROS, columns=["anio", "provincia"] + columnas, filters=filtros,
+                          partitioning=particionado(), memory_map=True)
+
+    data = tabla.to_pandas()
+    # pyarrow devuelve como float los enteros con nulos
+    if "Venezuela" in data:
+        data["Venezuela"] = data["Venezuela"].astype("Int32")
+    return data.set_index(["anio", "provincia"]).sort_index()
+
+
+def version_extranjeros():
+    # cambia cuando se reescribe algún csv (por ejemplo, al correr ingesta.py
+    # con la app levantada); los caches que dependen de los datos la llevan en la clave
+    estados = [os.stat(CSV_EXTRANJEROS.format(year=year)) for year in ANIOS]
+    return tuple((estado.st_mtime_ns, estado.st_size) for estado in estados)
+
+
+# carga única por versión de los csv: el DataFrame se comparte entre todas las
+# sesiones, por lo que nunca debe modificarse en el lugar
+@st.cache_resource(show_spinner=False, max_entries=2)
+def extranjeros_version(version):
+    if not dataset_al_dia():
+        construir_dataset()
+    return leer_dataset()
+
+
+def cargar_extranjeros():
+    return extranjeros_version(version_extranjeros())
+
+
+# serie completa de cada nacionalidad por provincia y para el total del país,
+# en formato largo (anio, provincia, nacionalidad, porcentaje, variacion), con la
+# variación interanual en puntos porcentuales. Se calcula una vez por versión
+@st.cache_resource(show_spinner=False, max_entries=2)
+def tendencias_extranjeros(version):
+    import pandas as pd
+
+    cantidades = extranjeros_version(version)[COLUMNAS_CANTIDAD]
+    # el total del país sale de sumar las cantidades, no de promediar porcentajes
+    nacional = cantidades.groupby(level="anio").sum(min_count=1)
+    nacional.index = pd.MultiIndex.from_product([nacional.index, [TOTAL_PAIS]], names=["anio", "provincia"])
+    cantidades = pd.concat([cantidades, nacional])
+
+    porcentajes = cantidades[NACIONALIDADES].astype(float).div(cantidades["total_extranjeros"], axis=0) * 100
+    largo = (porcentajes.round(2)
+             .rename_axis(columns="nacionalidad")
+             .stack(future_stack=True)
+             .rename("porcentaje")
+             .reset_index())
+    largo["provincia"] = largo["provincia"].astype(str)
+    largo = largo.sort_values(["provincia", "nacionalidad", "anio"], ignore_index=True)
+    largo["variacion"] = largo.groupby(["provincia", "nacionalidad"])["porcentaje"].diff()
+    return largo
+
+
+def extranjeros_anio(year):
+    return cargar_extranjeros().xs(year, level="anio")
+
+
+def extranjeros_provincia(year, prov):
+    # búsqueda por índice (hash) en lugar de filtrar todo el DataFrame
+    try:
+        return cargar_extranjeros().loc[(year, prov)]
+    except KeyError:
+        return None
+
+
+if __name__ == "__main__":
+    construir_dataset()
+    print(f"{len(ANIOS)} años convertidos a {DATASET_EXTRANJEROS}")
@@ -0,0 +1,392 @@
+# exporta el tablero a un sitio estático: recorre cada página del menú y cada
+# combinación de sus radios y selectbox con AppTest (el mismo script que sirve
+# streamlit) y escribe un html por vista. Gráficos, imágenes, el geojson de
+# cada año y los scripts van en assets/ con el hash del contenido en el nombre,
+# así pueden cachearse sin vencimiento; los html se sirven sin cache.
+# Uso, desde la raíz del repositorio: python exportar.py [--salida sitio] [--app-url URL]
+import argparse
+import hashlib
+import html
+import itertools
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unicodedata
+from unittest import mock
+
+import plotly
+import pyarrow as pa
+from markdown_it import MarkdownIt
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+
+SALIDA = "sitio"
+# archivo que deja el exportador en la carpeta de salida: sólo se borra una
+# carpeta que lo tenga (o vacía), nunca una elegida por error con --salida
+MARCA_SITIO = ".sitio-exportado"
+TIMEOUT = 600
+
+LEAFLET_CSS = "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"
+LEAFLET_JS = "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"
+
+ESTILOS = """
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #31333f; }
+.lateral { position: fixed; top: 0; bottom: 0; left: 0; width: 15rem; padding: 1.5rem 1rem;
+           overflow-y: auto; background: #f0f2f6; }
+.lateral a { display: block; padding: .3rem 0; color: inherit; text-decoration: none; }
+.lateral a.actual { font-weight: bold; color: #ff4b4b; }
+.principal { margin-left: 17rem; padding: 2rem 3rem; }
+.fila { display: flex; gap: 1rem; }
+.fila > div { min-width: 0; }
+img { max-width: 100%; }
+.selector { margin: .5rem 0 1rem; }
+.selector label { display: block; font-size: .9rem; margin-bottom: .2rem; }
+.opciones a { margin-right: 1rem; color: inherit; }
+.opciones a.actual { font-weight: bold; color: #ff4b4b; text-decoration: none; }
+.metrica .etiqueta { font-size: .9rem; }
+.metrica .valor { font-size: 2rem; }
+.mapa-provincias { height: 700px; }
+.grafico-plotly { min-height: 450px; }
+table { border-collapse: collapse; }
+td, th { padding: .2rem .6rem; border: 1px solid #e6e9ef; text-align: right; }
+"""
+
+# carga los gráficos de plotly y arma el mapa por año a partir de su geojson;
+# al hacer click en una provincia se completa el panel de datos como en la app
+SCRIPT = """
+document.querySelectorAll(".grafico-plotly").forEach(async (div) => {
+  const figura = await (await fetch(div.dataset.src)).json();
+  Plotly.newPlot(div, figura.data, figura.layout, {responsive: true, displaylogo: false});
+});
+
+const formato = (valor) => valor.toLocaleString("en-US", {maximumFractionDigits: 20});
+
+function metricas(pares, datos) {
+  return '<div class="fila">' + pares.filter(([, col]) => datos[col] !== null).map(([etiqueta, col, sufijo]) =>
+    `<div style="flex: 1"><div class="metrica"><div class="etiqueta">${etiqueta}</div>` +
+    `<div class="valor">${formato(datos[col])}${sufijo || ""}</div></div></div>`).join("") + "</div>";
+}
+
+function mostrarProvincia(nombre, datos, anio) {
+  const panel = document.getElementById("panel-provincia");
+  if (!panel || !datos[nombre]) return;
+  const nacionalidades = ["Bolivia", "Paraguay", "Perú", "Venezuela", "Otros"];
+  panel.innerHTML = `<h3>Datos para ${nombre} en el año ${anio}</h3>` +
+    metricas([["Total Extranjeros", "total_extranjeros"], ...nacionalidades.map((n) => [n, n])], datos[nombre]) +
+    metricas(nacionalidades.map((n) => [`Porcentaje ${n}`, `porcentaje_${n}`, " %"]), datos[nombre]);
+}
+
+document.querySelectorAll(".mapa-provincias").forEach(async (div) => {
+  const [geojson, datos] = await Promise.all(
+    [div.dataset.geojson, div.dataset.datos].map(async (url) => (await fetch(url)).json()));
+  const campos = JSON.parse(div.dataset.campos);
+  const mapa = L.map(div, {scrollWheelZoom: false}).setView([-40.4161, -63.6167], 4);
+  L.tileLayer("https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+              {attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'})
+    .addTo(mapa);
+  L.geoJSON(geojson, {
+    style: {fillColor: "#ff1493", color: "black", weight: 1, fillOpacity: 0.4},
+    onEachFeature: (feature, capa) => {
+      capa.bindTooltip("<table>" + campos.map(([campo, alias]) =>
+        `<tr><th>${alias}</th><td>${formato(feature.properties[campo])}</td></tr>`).join("") + "</table>",
+        {sticky: true});
+      capa.on("click", () => mostrarProvincia(feature.properties.nombre, datos, div.dataset.anio));
+    },
+  }).addTo(mapa);
+});
+"""
+
+markdown = MarkdownIt("commonmark").enable("table")
+
+ACTUAL = ' class="actual"'
+
+
+def slug(texto):
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", texto.lower()).strip("-")
+
+
+class Sitio:
+
+    def __init__(self, salida, app_url):
+        self.salida = salida
+        self.app_url = app_url
+        self.assets = {}
+        os.makedirs(os.path.join(salida, "assets"), exist_ok=True)
+        with open(os.path.join(salida, MARCA_SITIO), "w") as f:
+            f.write("generado por exportar.py\n")
+
+    def asset(self, contenido, nombre, extension):
+        # assets/<nombre>.<hash>.<extensión>: el mismo contenido se escribe una sola vez
+        if isinstance(contenido, str):
+            contenido = contenido.encode()
+        digest = hashlib.sha256(contenido).hexdigest()[:12]
+        ruta = f"assets/{nombre}.{digest}.{extension}"
+        if ruta not in self.assets:
+            with open(os.path.join(self.salida, ruta), "wb") as f:
+                f.write(contenido)
+            self.assets[ruta] = len(contenido)
+        return ruta
+
+    def escribir(self, nombre, contenido):
+        with open(os.path.join(self.salida, nombre), "w") as f:
+            f.write(contenido)
+
+
+def archivo_vista(pagina, radios=None, selectores=None):
+    # la página de inicio es index.html; las demás, <página>[__r<radios>][__s<selectores>].html
+    if pagina == "Inicio":
+        return "index.html"
+    nombre = slug(pagina)
+    if radios:
+        nombre += "__r" + "-".join(map(str, radios))
+    if selectores:
+        nombre += "__s" + "-".join(map(str, selectores))
+    return nombre + ".html"
+
+
+class AlmacenMedia(MemoryMediaFileStorage):
+    # AppTest crea un almacenamiento en memoria para las imágenes de cada rerun y
+    # lo descarta al terminar: éste guarda una referencia al último para leerlas
+    ultimo = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        AlmacenMedia.ultimo = self
+
+
+def contenido_media(url):
+    return AlmacenMedia.ultimo.get_file(url.rsplit("/", 1)[-1]).content
+
+
+def tabla_arrow(proto):
+    # con un Styler, los valores ya formateados vienen aparte
+    datos = proto.styler.display_values if proto.HasField("styler") and proto.styler.display_values else proto.data
+    df = pa.ipc.open_stream(datos).read_all().to_pandas()
+    return df.to_html(border=0, na_rep="-")
+
+
+class Vista:
+    # arma el html de una vista a partir del árbol de elementos que dejó AppTest
+
+    def __init__(self, sitio, at, pagina, radios, selectores):
+        self.sitio = sitio
+        self.at = at
+        self.pagina = pagina
+        self.radios = radios
+        self.selectores = selectores
+        self.n_radio = 0
+        self.n_selector = 0
+        self.usa_plotly = False
+        self.usa_leaflet = False
+        self.formulario = False
+
+    def enlace_radio(self, i, opcion):
+        radios = list(self.radios)
+        radios[i] = opcion
+        return archivo_vista(self.pagina, tuple(radios))
+
+    def enlace_selector(self, j, opcion):
+        selectores = list(self.selectores)
+        selectores[j] = opcion
+        return archivo_vista(self.pagina, self.radios, tuple(selectores))
+
+    def nodo(self, nodo):
+        tipo = getattr(nodo, "type", None)
+        proto = getattr(nodo, "proto", None)
+
+        if tipo in ("title", "header", "subheader"):
+            etiqueta = {"title": "h1", "header": "h2", "subheader": "h3"}[tipo]
+            return f"<{etiqueta}>{markdown.renderInline(proto.body)}</{etiqueta}>"
+        if tipo == "markdown":
+            return markdown.render(proto.body)
+        if tipo == "metric":
+            return (f'<div class="metrica"><div class="etiqueta">{html.escape(proto.label)}</div>'
+                    f'<div class="valor">{html.escape(proto.body)}</div></div>')
+        if tipo == "imgs":
+            return "".join(f'<img src="{self.sitio.asset(contenido_media(img.url), "imagen", "png")}">'
+                           for img in proto.imgs)
+        if tipo == "plotly_chart":
+            self.usa_plotly = True
+            ruta = self.sitio.asset(proto.spec, "grafico", "json")
+            return f'<div class="grafico-plotly" data-src="{ruta}"></div>'
+        if tipo in ("arrow_data_frame", "arrow_table"):
+            return tabla_arrow(proto)
+        if tipo == "iframe":
+            ruta = self.sitio.asset(proto.srcdoc, "mapa-evolucion", "html")
+            return f'<iframe src="{ruta}" style="width: 100%; border: 0" height="{proto.height}"></iframe>'
+        if tipo == "component_instance":
+            return self.mapa()
+        if tipo == "radio":
+            return self.radio(nodo)
+        if tipo == "selectbox":
+            return self.selector(nodo)
+        if tipo in ("text_input", "text_area", "button"):
+            self.formulario = True
+            return ""
+        if tipo == "expander":
+            return (f"<details><summary>{markdown.renderInline(proto.label)}</summary>"
+                    f"{self.hijos(nodo)}</details>")
+        if tipo == "horizontal":
+            return f'<div class="fila">{self.hijos(nodo)}</div>'
+        if tipo == "column":
+            contenido = self.hijos(nodo)
+            # la columna de métricas de la página de provincias: el mapa la reemplaza al hacer click
+            atributo = ' id="panel-provincia"' if contenido.startswith("<h3>Datos para") else ""
+            return f'<div style="flex: {proto.weight}"{atributo}>{contenido}</div>'
+        return self.hijos(nodo)
+
+    def hijos(self, nodo):
+        return "".join(self.nodo(hijo) for hijo in getattr(nodo, "children", {}).values())
+
+    def radio(self, nodo):
+        i = self.n_radio
+        self.n_radio += 1
+        opciones = "".join(
+            f'<a href="{self.enlace_radio(i, k)}"{ACTUAL if k == nodo.index else ""}>'
+            f"{html.escape(str(opcion))}</a>"
+            for k, opcion in enumerate(nodo.options))
+        return f'<div class="selector"><label>{html.escape(nodo.label)}</label><div class="opciones">{opciones}</div></div>'
+
+    def selector(self, nodo):
+        j = self.n_selector
+        self.n_selector += 1
+        opciones = "".join(
+            f'<option value="{self.enlace_selector(j, k)}"{" selected" if k == nodo.index else ""}>'
+            f"{html.escape(str(opcion))}</option>"
+            for k, opcion in enumerate(nodo.options))
+        return (f'<div class="selector"><label>{html.escape(nodo.label)}</label>'
+                f'<select onchange="location.href = this.value">{opciones}</select></div>')
+
+    def mapa(self):
+        # el mapa de st_folium se reemplaza por uno de Leaflet que lee el geojson del año
+        from datos import extranjeros_anio, version_extranjeros
+        from mapa import campos_tooltip, geojson_anio
+
+        self.usa_leaflet = True
+        year = self.at.selectbox[0].value
+        geojson = self.sitio.asset(json.dumps(geojson_anio(year, version_extranjeros()), ensure_ascii=False), f"provincias-{year}", "geojson")
+        datos = extranjeros_anio(year).astype(object).where(extranjeros_anio(year).notna(), None)
+        datos = self.sitio.asset(json.dumps(datos.to_dict(orient="index"), ensure_ascii=False),
+                                 f"extranjeros-{year}", "json")
+        campos = html.escape(json.dumps(campos_tooltip(year), ensure_ascii=False))
+        return (f'<div class="mapa-provincias" data-anio="{year}" data-geojson="{geojson}" '
+                f'data-datos="{datos}" data-campos="{campos}"></div>')
+
+    def documento(self, paginas, logo):
+        cuerpo = self.hijos(self.at.main)
+        if self.formulario:
+            enlace = f' en <a href="{html.escape(self.sitio.app_url)}">la aplicación</a>' if self.sitio.app_url else ""
+            cuerpo += f"<p>El formulario de contacto está disponible{enlace}.</p>"
+
+        menu = "".join(
+            f'<a href="{archivo_vista(pagina)}"{ACTUAL if pagina == self.pagina else ""}>'
+            f"{html.escape(pagina)}</a>"
+            for pagina in paginas)
+
+        cabecera = [f'<link rel="stylesheet" href="{self.sitio.estilos}">']
+        scripts = []
+        if self.usa_leaflet:
+            cabecera.append(f'<link rel="stylesheet" href="{LEAFLET_CSS}">')
+            scripts.append(f'<script src="{LEAFLET_JS}"></script>')
+        if self.usa_plotly:
+            scripts.append(f'<script src="{self.sitio.plotly}"></script>')
+        if self.usa_leaflet or self.usa_plotly:
+            scripts.append(f'<script src="{self.sitio.script}"></script>')
+
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Calidad de Escuelas en Argentina</title>
+{"".join(cabecera)}
+</head>
+<body>
+<nav class="lateral"><img src="{logo}"><hr>{menu}</nav>
+<main class="principal">{cuerpo}</main>
+{"".join(scripts)}
+</body>
+</html>
+"""
+
+
+def combinaciones(at):
+    # deja cargada en `at` cada combinación de radios y selectbox del cuerpo de la
+    # página; devuelve los índices elegidos y los índices por defecto de los selectbox
+    cantidades_radio = [len(radio.options) for radio in at.main.radio]
+    for radios in itertools.product(*[range(n) for n in cantidades_radio]):
+        for i, indice in enumerate(radios):
+            at.main.radio[i].set_value(at.main.radio[i].options[indice])
+        at.run()
+
+        defectos = tuple(sb.proto.default for sb in at.selectbox)
+        for selectores in itertools.product(*[range(len(sb.options)) for sb in at.selectbox]):
+            for j, indice in enumerate(selectores):
+                at.selectbox[j].select_index(indice)
+            at.run()
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+            yield radios, selectores, defectos
+
+
+def exportar(salida=SALIDA, app_url=None):
+    sys.path.insert(0, ".")
+    from app import PAGINAS
+
+    if os.path.exists(salida):
+        if os.listdir(salida) and not os.path.exists(os.path.join(salida, MARCA_SITIO)):
+            raise FileExistsError(f"{salida} no está vacía y no la generó exportar.py: no se borra")
+        shutil.rmtree(salida)
+    sitio = Sitio(salida, app_url)
+    sitio.estilos = sitio.asset(ESTILOS, "estilos", "css")
+    sitio.script = sitio.asset(SCRIPT, "sitio", "js")
+    with open(os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js"), "rb") as f:
+        sitio.plotly = sitio.asset(f.read(), "plotly", "js")
+
+    at = AppTest.from_file("app.py", default_timeout=TIMEOUT)
+    at.run()
+    logo = sitio.asset(contenido_media(at.sidebar.get("imgs")[0].proto.imgs[0].url), "logo", "png")
+
+    vistas = 0
+    for pagina in PAGINAS:
+        at.sidebar.radio[0].set_value(pagina)
+        at.run()
+
+        for radios, selectores, defectos in combinaciones(at):
+            documento = Vista(sitio, at, pagina, radios, selectores).documento(PAGINAS, logo)
+            sitio.escribir(archivo_vista(pagina, radios, selectores), documento)
+            # la vista por defecto de cada radio y de la página, para los enlaces del menú y los radios
+            if selectores == defectos:
+                sitio.escribir(archivo_vista(pagina, radios), documento)
+                if not any(radios):
+                    sitio.escribir(archivo_vista(pagina), documento)
+            vistas += 1
+
+    return vistas, sitio.assets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--salida", default=SALIDA, help="carpeta donde se escribe el sitio")
+    parser.add_argument("--app-url", help="URL de la app en vivo, para el formulario de contacto")
+    args = parser.parse_args()
+
+    # la app abre el buzón de contacto al arrancar: se le da uno vacío en un
+    # directorio temporal, así la exportación no toca buzon_contacto.sqlite3 ni
+    # manda sus mensajes pendientes (el hilo del buzón termina con el proceso)
+    with mock.patch("streamlit.testing.v1.app_test.MemoryMediaFileStorage", AlmacenMedia), \
+            tempfile.TemporaryDirectory() as carpeta, \
+            mock.patch.dict(os.environ, {"BUZON_CONTACTO": os.path.join(carpeta, "buzon.sqlite3")}):
+        try:
+            vistas, assets = exportar(args.salida, args.app_url)
+        except FileExistsError as error:
+            parser.error(str(error))
+    print(f"{vistas} vistas y {len(assets)} assets ({sum(assets.values()) / 1024 / 1024:.1f} MB) en {args.salida}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import os
+
+import streamlit as st
+
+from imagenes import mostrar_imagen
+from rendimiento import tramo
+
+# una tabla chica por indicador (provincia x año x tipo de escuela x categoría,
+# con la cantidad de escuelas), a partir de la cual se dibujan los gráficos con
+# plotly. Si la tabla de un indicador no está, se muestran los png de siempre
+AGREGADOS_INDICADORES = "indicadores"
+
+# categorías de cada indicador, en el orden y con los colores de los png
+INDICADORES = {
+    "comida": {
+        "tema": "Beneficios Alimenticios Gratuitos",
+        "categorias": {"Con comida gratuita": "#3cb371", "Sin comida gratuita": "#d63384"},
+    },
+    "sector": {
+        "tema": "Sector",
+        "categorias": {"Estatal": "#4682b4", "Privado": "#f4a261"},
+    },
+    "electricidad": {
+        "tema": "Acceso a Electricidad",
+        "categorias": {"Con Red Pública": "#3cb371", "Otros Tipos de Electricidad": "#4682b4",
+                       "Sin Electricidad": "#d63384"},
+    },
+    "internet": {
+        "tema": "Acceso a Internet",
+        "categorias": {"Con Internet Gratuito": "#7fce7f", "Con Internet Pago": "#61b5ff",
+                       "Sin Internet": "#ffa07a"},
+    },
+    "biblioteca": {
+        "tema": "Disponibilidad de Biblioteca",
+        "categorias": {"Con Biblioteca": "#3cb371", "Sin Biblioteca": "#d63384"},
+    },
+}
+
+TITULOS_TIPO = {
+    "total": "Total de Escuelas",
+    "con_extranjeros": "Escuelas con Extranjeros",
+    "sin_extranjeros": "Escuelas sin Extranjeros",
+}
+
+
+def ruta_agregado(indicador):
+    return os.path.join(AGREGADOS_INDICADORES, f"{indicador}.parquet")
+
+
+def version_agregado(indicador):
+    # None si la tabla no está; cambia cuando ingesta.py la vuelve a escribir
+    try:
+        estado = os.stat(ruta_agregado(indicador))
+    except FileNotFoundError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+
+# columnas: anio, provincia, [nivel,] tipo ("con_extranjeros" / "sin_extranjeros"),
+# categoria, escuelas. El total de escuelas no se guarda: es la suma de los dos tipos.
+# Los años que no se relevaron (biblioteca en 2011) directamente no tienen filas.
+# La versión forma parte de la clave: una tabla nueva o reescrita se lee sin
+# reiniciar la app
+@st.cache_resource(show_spinner=False, max_entries=2 * len(INDICADORES))
+def leer_agregado(indicador, version):
+    import pandas as pd
+
+    if version is None:
+        return None
+    return pd.read_parquet(ruta_agregado(indicador), memory_map=True)
+
+
+def escuelas_seleccion(indicador, version, tipo, nivel, anio):
+    # escuelas por provincia y categoría para lo elegido en los selectores
+    data = leer_agregado(indicador, version)
+    filtro = data["anio"] == anio
+    if tipo != "total":
+        filtro &= data["tipo"] == tipo
+    if nivel is not None and "nivel" in data:
+        filtro &= data["nivel"] == nivel
+
+    categorias = list(INDICADORES[indicador]["categorias"])
+    return (data[filtro]
+            .groupby(["provincia", "categoria"], observed=True)["escuelas"].sum()
+            .unstack("categoria", fill_value=0)
+            .reindex(columns=categorias, fill_value=0))
+
+
+# figuras compartidas entre sesiones: no se modifican después de crearlas
+@st.cache_resource(show_spinner=False, max_entries=512)
+def figura_indicador(indicador, version, forma, tipo, nivel, anio):
+    import plotly.express as px
+
+    escuelas = escuelas_seleccion(indicador, version, tipo, nivel, anio)
+    if escuelas.empty:
+        return None
+
+    colores = INDICADORES[indicador]["categorias"]
+    tema = INDICADORES[indicador]["tema"]
+
+    if forma == "torta":
+        pais = escuelas.sum().rename_axis("categoria").reset_index(name="escuelas")
+        fig = px.pie(pais, names="categoria", values="escuelas", color="categoria",
+                     color_discrete_map=colores, category_orders={"categoria": list(colores)},
+                     title=f"Distribución de {TITULOS_TIPO[tipo]}<br>según {tema} en Argentina ({anio})")
+        fig.update_traces(sort=False, texttemplate="%{percent:.2%}",
+                          hovertemplate="%{label}: %{value:,} escuelas (%{percent:.2%})<extra></extra>")
+        return fig
+
+    porcentajes = (escuelas.div(escuelas.sum(axis=1), axis=0) * 100).round(2)
+    largo = (porcentajes.sort_index(ascending=False)
+             .stack().rename("porcentaje").reset_index()
+             .merge(escuelas.stack().rename("escuelas").reset_index(), on=["provincia", "categoria"]))
+    fig = px.bar(largo, x="porcentaje", y="provincia", color="categoria", orientation="h",
+                 color_discrete_map=colores, category_orders={"categoria": list(colores)},
+                 text="porcentaje", custom_data=["escuelas"],
+                 labels={"porcentaje": "Porcentaje de Escuelas", "provincia": "Provincia", "categoria": ""},
+                 title=f"Porcentaje del {TITULOS_TIPO[tipo]}<br>por Provincia y {tema} en Argentina ({anio})")
+    fig.update_traces(hovertemplate="%{y}: %{x:.2f} % (%{customdata[0]:,} escuelas)<extra></extra>")
+    fig.update_layout(barmode="stack", height=80 + 28 * len(escuelas), xaxis={"range": [0, 100]})
+    return fig
+
+
+def mostrar_grafico(pagina, indicador, forma, tipo, nivel=None, anio=None, fraccion=1.0):
+    # forma: "torta" (total del país) o "barras" (por provincia)
+    version = version_agregado(indicador)
+    if version is None:
+        mostrar_imagen(pagina, f"{indicador}_{forma}", tipo, nivel, anio, fraccion=fraccion)
+        return
+
+    with tramo("grafico", indicador=f"{indicador}_{forma}", anio=anio):
+        fig = figura_indicador(indicador, version, forma, tipo, nivel, anio)
+        if fig is None:
+            st.write(f"Sin datos para el año {anio}")
+        else:
+            st.plotly_chart(fig, use_container_width=True)
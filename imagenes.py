@@ -0,0 +1,361 @@
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import streamlit as st
+from PIL import Image
+
+from datos import ANIOS
+from rendimiento import tramo
+
+# todos los gráficos en un único archivo + un índice, generados a partir de los
+# png del repositorio con `python imagenes.py`, como paso de build o de deploy.
+# No se versionan, y la app nunca los genera: si faltan o quedaron viejos, lo
+# avisa en el log y muestra los png originales
+BUNDLE_IMAGENES = "paquete_imagenes.bin"
+MANIFEST_IMAGENES = "paquete_imagenes.json"
+
+TIPOS_ESCUELA = ["total", "con_extranjeros", "sin_extranjeros"]
+NIVELES = ["primaria", "secundaria"]
+RECURSOS = ["electricidad", "internet", "biblioteca"]
+PAISES = ["Bolivia", "Paraguay", "Perú", "Venezuela"]
+
+# anchos (px) de las variantes de cada gráfico. 1460 es lo máximo que envía
+# st.image: una imagen más ancha la achica a ese ancho antes de mandarla
+ANCHOS_VARIANTES = [480, 730, 1460]
+ANCHO_MAXIMO = ANCHOS_VARIANTES[-1]
+# la app usa layout="wide": en un monitor de escritorio de 1920 px, sin la barra
+# lateral ni los márgenes, el contenido ocupa unos 1420 px CSS, el doble en
+# pantallas de alta densidad
+ANCHO_CONTENIDO = 1420
+DENSIDAD_PIXELES = 2
+# en el celular las columnas se apilan y el ancho útil ronda los 360-400 px
+ANCHO_MOVIL = 730
+
+# tope de memoria del cache de imágenes que comparten todas las sesiones
+LIMITE_CACHE_IMAGENES = int(os.environ.get("LIMITE_CACHE_IMAGENES_MB", "64")) * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+# clave (página, indicador, tipo de escuela, nivel, año) -> png de origen.
+# Acá quedan todas las particularidades de los nombres de archivo
+def catalogo_imagenes():
+    sufijos = {"total": "", "con_extranjeros": "extranjeros_", "sin_extranjeros": "sin_extranjeros_"}
+    torta_infraestructura = {
+        "biblioteca": "disponibilidad_biblioteca",
+        "electricidad": "acceso_electricidad_nacional",
+        "internet": "acceso_internet",
+    }
+    barras_infraestructura = {
+        "biblioteca": "disponibilidad_biblioteca",
+        "electricidad": "tipo_electricidad",
+        "internet": "tipo_internet",
+    }
+
+    rutas = {}
+    for year in ANIOS:
+        rutas[("provincia", "tabla_nacionalidades", None, None, year)] = \
+            f"extranjeros_por_provincia/tabla_distribucion_nacionalidades_{year}.png"
+
+        for pais in PAISES:
+            rutas[("general", f"distribucion_{pais}", None, None, year)] = \
+                f"distribucion/{year}/distribucion_{pais}en_el_pais{year}.png"
+
+        for nivel in NIVELES:
+            for tipo in TIPOS_ESCUELA:
+                carpeta = f"beneficios_alimenticios/{nivel}" if tipo == "total" else f"beneficios_alimenticios/{nivel}/{tipo}"
+                nombre = f"escuelas_{nivel}s_con_y_sin_comida_{year}" if tipo == "total" else f"escuelas_{nivel}s_{tipo}_con_y_sin_comida_{year}"
+                rutas[("beneficios", "comida_torta", tipo, nivel, year)] = f"{carpeta}/{nombre}.png"
+                rutas[("beneficios", "comida_barras", tipo, nivel, year)] = f"{carpeta}/barras_por_provincia_{nombre}.png"
+
+        for tipo in TIPOS_ESCUELA:
+            rutas[("sector", "sector_torta", tipo, None, year)] = \
+                f"sector/{year}/grafico_torta_escuelas_sector_{sufijos[tipo]}{year}.png"
+            rutas[("sector", "sector_barras", tipo, None, year)] = \
+                f"sector/{year}/porcentaje_de_escuelas_por_provincia_sector_{sufijos[tipo]}{year}.png"
+
+            for recurso in RECURSOS:
+                # el total de internet tiene sufijos propios en cada gráfico
+                sufijo_torta = "nacional_" if (recurso, tipo) == ("internet", "total") else sufijos[tipo]
+                sufijo_barras = "total_" if (recurso, tipo) == ("internet", "total") else sufijos[tipo]
+                rutas[("infraestructura", f"{recurso}_torta", tipo, None, year)] = \
+                    f"infraestructura/{recurso}/{year}/grafico_torta_{torta_infraestructura[recurso]}_{sufijo_torta}{year}.png"
+                rutas[("infraestructura", f"{recurso}_barras", tipo, None, year)] = \
+                    f"infraestructura/{recurso}/{year}/porcentaje_de_escuelas_por_provincia_{barras_infraestructura[recurso]}_{sufijo_barras}{year}.png"
+
+    return rutas
+
+
+def firma_catalogo(rutas):
+    # cambia si se agrega, quita o modifica alguno de los png de origen. Por
+    # contenido y no por fecha: un clon nuevo o un deploy no invalidan el bundle
+    firma = []
+    for ruta in sorted(rutas.values()):
+        if os.path.exists(ruta):
+            with open(ruta, "rb") as f:
+                firma.append([ruta, os.fstat(f.fileno()).st_size, hashlib.sha256(f.read()).hexdigest()])
+    return firma
+
+
+def variantes_png(ruta):
+    # una versión por ancho, en png con paleta: st.image la envía tal cual, sin
+    # redimensionar ni recodificar (un png RGB lo pasaría a JPEG en cada rerun)
+    original = Image.open(ruta)
+    variantes = {}
+    for ancho in ANCHOS_VARIANTES:
+        ancho = min(ancho, original.width)
+        if ancho in variantes:
+            continue
+        escalada = original
+        if ancho < original.width:
+            escalada = original.resize((ancho, round(original.height * ancho / original.width)), Image.LANCZOS)
+        # los gráficos son colores planos y texto: con 256 colores no se nota la diferencia
+        salida = io.BytesIO()
+        escalada.quantize(256, method=Image.Quantize.FASTOCTREE).save(salida, "PNG", optimize=True)
+        variantes[ancho] = salida.getvalue()
+    return variantes
+
+
+def construir_bundle(bundle=BUNDLE_IMAGENES, manifest=MANIFEST_IMAGENES):
+    rutas = {clave: ruta for clave, ruta in catalogo_imagenes().items() if os.path.exists(ruta)}
+    entradas = []
+    offset = 0
+
+    with open(bundle + ".tmp", "wb") as salida, ProcessPoolExecutor() as procesos:
+        for ((pagina, indicador, tipo, nivel, year), ruta), variantes in zip(
+                rutas.items(), procesos.map(variantes_png, rutas.values(), chunksize=8)):
+            for ancho, contenido in variantes.items():
+                salida.write(contenido)
+                entradas.append({
+                    "pagina": pagina, "indicador": indicador, "tipo": tipo, "nivel": nivel, "anio": year,
+                    "ancho": ancho, "ruta": ruta, "offset": offset, "largo": len(contenido),
+                })
+                offset += len(contenido)
+
+    with open(manifest + ".tmp", "w") as f:
+        json.dump({"firma": firma_catalogo(rutas), "anchos": ANCHOS_VARIANTES, "imagenes": entradas},
+                  f, ensure_ascii=False)
+
+    # reemplazo atómico: una sesión que ya tenga abierto el bundle anterior no se entera
+    os.replace(bundle + ".tmp", bundle)
+    os.replace(manifest + ".tmp", manifest)
+
+    faltantes = len(catalogo_imagenes()) - len(rutas)
+    return len(rutas), faltantes, offset
+
+
+def leer_manifest(manifest=MANIFEST_IMAGENES):
+    if not os.path.exists(manifest):
+        return None
+    with open(manifest) as f:
+        return json.load(f)
+
+
+# None si el bundle no se puede usar: las imágenes salen de los png originales
+@st.cache_resource(show_spinner=False)
+def cargar_bundle():
+    rutas = catalogo_imagenes()
+    contenido = leer_manifest()
+    if contenido is None or not os.path.exists(BUNDLE_IMAGENES):
+        logger.warning("No está %s: se muestran los png originales (generarlo con python imagenes.py)",
+                       BUNDLE_IMAGENES)
+        return None
+    if contenido.get("anchos") != ANCHOS_VARIANTES or contenido["firma"] != firma_catalogo(rutas):
+        logger.warning("%s no corresponde a los png actuales: se muestran los png originales "
+                       "(regenerarlo con python imagenes.py)", BUNDLE_IMAGENES)
+        return None
+
+    with open(BUNDLE_IMAGENES, "rb") as f:
+        mapeado = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    vista = memoryview(mapeado)
+
+    # validación al arrancar: cada entrada tiene que caer dentro del bundle
+    indice = {}
+    for entrada in contenido["imagenes"]:
+        if entrada["offset"] + entrada["largo"] > len(mapeado):
+            logger.warning("%s está corrupto (%s): se muestran los png originales", BUNDLE_IMAGENES, entrada["ruta"])
+            return None
+        clave = (entrada["pagina"], entrada["indicador"], entrada["tipo"], entrada["nivel"], entrada["anio"])
+        indice.setdefault(clave, []).append((entrada["ancho"], entrada["offset"], entrada["largo"]))
+    for variantes in indice.values():
+        variantes.sort()
+
+    faltantes = [clave for clave in rutas if clave not in indice]
+    if faltantes:
+        logger.info("%d combinaciones sin imagen, se muestran como 'sin datos'", len(faltantes))
+
+    return vista, indice
+
+
+def ubicar(indice, clave, ancho):
+    # (offset, largo) de la variante más chica que cubre el ancho pedido (o la
+    # más grande que haya); None si no hay datos
+    variantes = indice.get(clave)
+    if variantes is None:
+        return None
+    _, offset, largo = next((v for v in variantes if v[0] >= ancho), variantes[-1])
+    return offset, largo
+
+
+def ruta_original(clave):
+    ruta = catalogo_imagenes().get(clave)
+    return ruta if ruta is not None and os.path.exists(ruta) else None
+
+
+def imagen(pagina, indicador, tipo=None, nivel=None, anio=None, ancho=ANCHO_MAXIMO):
+    # porción del archivo mapeado en memoria, sin copiar
+    bundle = cargar_bundle()
+    if bundle is None:
+        ruta = ruta_original((pagina, indicador, tipo, nivel, anio))
+        if ruta is None:
+            return None
+        with open(ruta, "rb") as f:
+            return f.read()
+    vista, indice = bundle
+    ubicacion = ubicar(indice, (pagina, indicador, tipo, nivel, anio), ancho)
+    if ubicacion is None:
+        return None
+    offset, largo = ubicacion
+    return vista[offset:offset + largo]
+
+
+class CacheImagenes:
+    # LRU de bytes con tope de memoria, compartido entre sesiones e hilos
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self.ocupado = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._entradas
+
+    def obtener(self, clave, cargar):
+        with self._lock:
+            contenido = self._entradas.get(clave)
+            if contenido is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return contenido
+            self.fallos += 1
+
+        contenido = cargar()
+        self.guardar(clave, contenido)
+        return contenido
+
+    def guardar(self, clave, contenido):
+        if len(contenido) > self.limite_bytes:
+            return
+        with self._lock:
+            if clave in self._entradas:
+                return
+            self._entradas[clave] = contenido
+            self.ocupado += len(contenido)
+            while self.ocupado > self.limite_bytes:
+                _, desalojado = self._entradas.popitem(last=False)
+                self.ocupado -= len(desalojado)
+                self.desalojos += 1
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "ocupado": self.ocupado,
+                "limite": self.limite_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def cache_imagenes():
+    return CacheImagenes(LIMITE_CACHE_IMAGENES)
+
+
+@st.cache_resource(show_spinner=False)
+def hilos_precarga():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="precarga_imagenes")
+
+
+def copiar(vista, ubicacion):
+    offset, largo = ubicacion
+    return bytes(vista[offset:offset + largo])
+
+
+def imagen_en_cache(pagina, indicador, tipo=None, nivel=None, anio=None, ancho=ANCHO_MAXIMO):
+    bundle = cargar_bundle()
+    if bundle is None:
+        ruta = ruta_original((pagina, indicador, tipo, nivel, anio))
+        return None if ruta is None else imagen_archivo(ruta)
+    vista, indice = bundle
+    ubicacion = ubicar(indice, (pagina, indicador, tipo, nivel, anio), ancho)
+    if ubicacion is None:
+        return None
+    return cache_imagenes().obtener(ubicacion, lambda: copiar(vista, ubicacion))
+
+
+def imagen_archivo(ruta):
+    # imágenes sueltas fuera del bundle (el logo), por el mismo cache
+    def leer():
+        with open(ruta, "rb") as f:
+            return f.read()
+    return cache_imagenes().obtener(("archivo", ruta), leer)
+
+
+# quien mira el año N suele pasar después al N-1 o al N+1: se dejan en el cache
+# en segundo plano, sin frenar el rerun actual
+def precargar_anios_vecinos(pagina, indicador, tipo, nivel, anio, ancho):
+    bundle = cargar_bundle()
+    if bundle is None:
+        return
+    vista, indice = bundle
+    cache = cache_imagenes()
+    for vecino in (anio - 1, anio + 1):
+        ubicacion = ubicar(indice, (pagina, indicador, tipo, nivel, vecino), ancho)
+        if ubicacion is not None and ubicacion not in cache:
+            hilos_precarga().submit(lambda u=ubicacion: cache.guardar(u, copiar(vista, u)))
+
+
+def es_movil():
+    return "Mobi" in st.context.headers.get("User-Agent", "")
+
+
+def ancho_escritorio(fraccion):
+    # fraccion: qué parte del ancho de la página ocupa la columna de la imagen
+    return min(round(ANCHO_CONTENIDO * DENSIDAD_PIXELES * fraccion), ANCHO_MAXIMO)
+
+
+def ancho_columna(fraccion):
+    return ANCHO_MOVIL if es_movil() else ancho_escritorio(fraccion)
+
+
+def mostrar_imagen(pagina, indicador, tipo=None, nivel=None, anio=None, fraccion=1.0):
+    ancho = ancho_columna(fraccion)
+    with tramo("imagen", indicador=indicador, anio=anio):
+        contenido = imagen_en_cache(pagina, indicador, tipo, nivel, anio, ancho)
+        if contenido is None:
+            st.write(f"Sin datos para el año {anio}")
+        else:
+            st.image(contenido, use_column_width='auto')
+
+    if anio is not None:
+        precargar_anios_vecinos(pagina, indicador, tipo, nivel, anio, ancho)
+
+
+if __name__ == "__main__":
+    cantidad, faltantes, total = construir_bundle()
+    print(f"{cantidad} imágenes en {len(ANCHOS_VARIANTES)} anchos ({total / 1024 / 1024:.1f} MB) en {BUNDLE_IMAGENES}, "
+          f"{faltantes} combinaciones sin imagen")
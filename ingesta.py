@@ -0,0 +1,234 @@
+# regenera los datos del tablero a partir de los microdatos por escuela del
+# relevamiento anual: los csv de extranjeros_por_provincia/ y las tablas de
+# indicadores/ que usan las páginas de beneficios, sector e infraestructura.
+#
+# Se espera un csv por año, <carpeta>/escuelas_<año>.csv, una fila por escuela:
+#   provincia, sector                 Estatal / Privado
+#   matricula_primaria, matricula_secundaria
+#   <nacionalidad>_<nivel>            alumnos/as extranjeros/as por nivel, para
+#                                     Bolivia, Paraguay, Perú, Venezuela y Otros
+#   comida_primaria, comida_secundaria   1 si el nivel ofrece comida gratuita
+#   electricidad                      red / otra / sin
+#   internet                          gratuito / pago / sin
+#   biblioteca                        1 / 0 (vacío si no se relevó)
+#
+# Los archivos se leen por bloques, así la memoria no depende del tamaño del
+# año, y cada año se procesa en un proceso aparte.
+# Uso: python ingesta.py carpeta_microdatos [--salida .] [--bloque 200000]
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from datos import ANIOS, CSV_EXTRANJEROS, NACIONALIDADES
+from graficos import AGREGADOS_INDICADORES, INDICADORES
+
+MICRODATOS_ANIO = "escuelas_{year}.csv"
+
+NIVELES = ["primaria", "secundaria"]
+
+# hasta 2013 los cuadernillos cuentan a Venezuela dentro de "Otros países de
+# América", y la biblioteca empieza a relevarse en 2012 (ver "A tener en cuenta")
+PRIMER_ANIO_VENEZUELA = 2014
+PRIMER_ANIO_BIBLIOTECA = 2012
+
+# código en los microdatos -> categoría de graficos.INDICADORES
+CATEGORIAS = {
+    "comida": {1: "Con comida gratuita", 0: "Sin comida gratuita"},
+    "sector": {"Estatal": "Estatal", "Privado": "Privado"},
+    "electricidad": {"red": "Con Red Pública", "otra": "Otros Tipos de Electricidad", "sin": "Sin Electricidad"},
+    "internet": {"gratuito": "Con Internet Gratuito", "pago": "Con Internet Pago", "sin": "Sin Internet"},
+    "biblioteca": {1: "Con Biblioteca", 0: "Sin Biblioteca"},
+}
+
+COLUMNAS_EXTRANJEROS = [f"{nacionalidad}_{nivel}" for nivel in NIVELES for nacionalidad in NACIONALIDADES]
+TIPOS_COLUMNAS = {
+    "provincia": "category",
+    "sector": "category",
+    "electricidad": "category",
+    "internet": "category",
+    "biblioteca": "float32",
+    **{f"matricula_{nivel}": "int32" for nivel in NIVELES},
+    **{f"comida_{nivel}": "int8" for nivel in NIVELES},
+    **{col: "int32" for col in COLUMNAS_EXTRANJEROS},
+}
+
+
+def tipo_escuela(extranjeros):
+    return np.where(extranjeros > 0, "con_extranjeros", "sin_extranjeros")
+
+
+def contar(df, columnas):
+    return df.groupby(columnas, observed=True).size()
+
+
+def procesar_bloque(bloque, year):
+    parciales = {}
+    descartes = 0
+
+    total_extranjeros = 0
+    por_nacionalidad = []
+    for nivel in NIVELES:
+        extranjeros = bloque[[f"{nacionalidad}_{nivel}" for nacionalidad in NACIONALIDADES]].to_numpy()
+        matricula = bloque[f"matricula_{nivel}"].to_numpy()
+        # escuelas que declaran extranjeros/as en un nivel sin matrícula en ese
+        # nivel: sus datos de ese nivel se descartan
+        inconsistente = (extranjeros.sum(axis=1) > 0) & (matricula == 0)
+        descartes += int(inconsistente.sum())
+        extranjeros = np.where(inconsistente[:, None], 0, extranjeros)
+        por_nacionalidad.append(extranjeros)
+        total_extranjeros = total_extranjeros + extranjeros.sum(axis=1)
+
+        valido = (matricula > 0) & ~inconsistente
+        comida = pd.DataFrame({
+            "provincia": bloque["provincia"].to_numpy()[valido],
+            "tipo": tipo_escuela(extranjeros.sum(axis=1)[valido]),
+            "nivel": nivel,
+            "categoria": bloque[f"comida_{nivel}"].to_numpy()[valido],
+        })
+        parciales[("comida", nivel)] = contar(comida, ["provincia", "nivel", "tipo", "categoria"])
+
+    extranjeros = pd.DataFrame(por_nacionalidad[0] + por_nacionalidad[1], columns=NACIONALIDADES)
+    if year < PRIMER_ANIO_VENEZUELA:
+        extranjeros["Otros"] += extranjeros["Venezuela"]
+        extranjeros["Venezuela"] = 0
+    extranjeros["provincia"] = bloque["provincia"].to_numpy()
+    parciales["extranjeros"] = extranjeros.groupby("provincia", observed=True).sum()
+
+    escuelas = bloque[["provincia", "sector", "electricidad", "internet", "biblioteca"]].assign(
+        tipo=tipo_escuela(total_extranjeros))
+    for indicador in ["sector", "electricidad", "internet"]:
+        parciales[indicador] = contar(escuelas.rename(columns={indicador: "categoria"}),
+                                      ["provincia", "tipo", "categoria"])
+    if year >= PRIMER_ANIO_BIBLIOTECA:
+        con_dato = escuelas.dropna(subset=["biblioteca"]).astype({"biblioteca": "int8"})
+        parciales["biblioteca"] = contar(con_dato.rename(columns={"biblioteca": "categoria"}),
+                                         ["provincia", "tipo", "categoria"])
+
+    return parciales, descartes
+
+
+def procesar_anio(ruta, year, bloque):
+    acumulado = {}
+    filas = descartes = 0
+    for df in pd.read_csv(ruta, usecols=list(TIPOS_COLUMNAS), dtype=TIPOS_COLUMNAS, chunksize=bloque):
+        parciales, descartados = procesar_bloque(df, year)
+        filas += len(df)
+        descartes += descartados
+        for clave, parcial in parciales.items():
+            acumulado[clave] = parcial if clave not in acumulado else acumulado[clave].add(parcial, fill_value=0)
+
+    indicadores = {}
+    for clave, parcial in acumulado.items():
+        if clave == "extranjeros":
+            continue
+        indicador = clave[0] if isinstance(clave, tuple) else clave
+        tabla = parcial.rename("escuelas").reset_index()
+        tabla["categoria"] = tabla["categoria"].map(CATEGORIAS[indicador])
+        tabla.insert(0, "anio", year)
+        indicadores.setdefault(indicador, []).append(tabla)
+
+    return {
+        "anio": year,
+        "filas": filas,
+        "descartes": descartes,
+        "extranjeros": acumulado["extranjeros"],
+        "indicadores": {indicador: pd.concat(tablas, ignore_index=True) for indicador, tablas in indicadores.items()},
+    }
+
+
+def escribir_extranjeros(extranjeros, year, salida):
+    # mismo formato que los csv existentes: sin columnas de Venezuela hasta 2013
+    nacionalidades = [n for n in NACIONALIDADES if year >= PRIMER_ANIO_VENEZUELA or n != "Venezuela"]
+    tabla = extranjeros[nacionalidades].astype("int64").sort_index()
+    tabla.insert(0, "total_extranjeros", tabla.sum(axis=1))
+    for nacionalidad in nacionalidades:
+        tabla[f"porcentaje_{nacionalidad}"] = (tabla[nacionalidad] / tabla["total_extranjeros"] * 100).round(2)
+
+    columnas = (["total_extranjeros"] + [n for n in nacionalidades if n != "Otros"]
+                + [f"porcentaje_{n}" for n in nacionalidades] + ["Otros"])
+    ruta = os.path.join(salida, CSV_EXTRANJEROS.format(year=year))
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla[columnas].rename_axis("provincia").to_csv(ruta + ".tmp", quoting=csv.QUOTE_NONNUMERIC)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def escribir_indicador(indicador, tablas, salida):
+    tabla = pd.concat(tablas, ignore_index=True).sort_values(["anio", "provincia", "tipo", "categoria"])
+    tabla = tabla.astype({"anio": "int16", "escuelas": "int32", "provincia": "category", "tipo": "category",
+                          "categoria": pd.CategoricalDtype(list(INDICADORES[indicador]["categorias"]))})
+    if "nivel" in tabla:
+        tabla["nivel"] = tabla["nivel"].astype("category")
+
+    ruta = os.path.join(salida, AGREGADOS_INDICADORES, f"{indicador}.parquet")
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla.to_parquet(ruta + ".tmp", index=False)
+    os.replace(ruta + ".tmp", ruta)
+
+
+class AnioFueraDeRango(ValueError):
+    pass
+
+
+def anios_disponibles(carpeta):
+    patron = re.compile(MICRODATOS_ANIO.format(year=r"(\d{4})") + "$")
+    anios = {}
+    for ruta in glob.glob(os.path.join(carpeta, MICRODATOS_ANIO.format(year="*"))):
+        coincidencia = patron.search(os.path.basename(ruta))
+        if coincidencia:
+            anios[int(coincidencia.group(1))] = ruta
+    return dict(sorted(anios.items()))
+
+
+def ingerir(carpeta, salida=".", bloque=200_000, procesos=None):
+    anios = anios_disponibles(carpeta)
+    if not anios:
+        raise FileNotFoundError(f"no hay archivos {MICRODATOS_ANIO.format(year='<año>')} en {carpeta}")
+    # un año fuera de datos.ANIOS se escribiría pero ninguna página lo mostraría
+    fuera = [year for year in anios if year not in ANIOS]
+    if fuera:
+        raise AnioFueraDeRango(f"{', '.join(map(str, fuera))} fuera de los años del tablero "
+                         f"({ANIOS[0]}-{ANIOS[-1]}): hay que agregarlos a ANIOS en datos.py antes de ingerirlos")
+
+    indicadores = {}
+    resumen = []
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(procesar_anio, ruta, year, bloque) for year, ruta in anios.items()]
+        for futuro in futuros:
+            resultado = futuro.result()
+            escribir_extranjeros(resultado["extranjeros"], resultado["anio"], salida)
+            for indicador, tabla in resultado["indicadores"].items():
+                indicadores.setdefault(indicador, []).append(tabla)
+            resumen.append((resultado["anio"], resultado["filas"], resultado["descartes"]))
+
+    for indicador, tablas in indicadores.items():
+        escribir_indicador(indicador, tablas, salida)
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("microdatos", help=f"carpeta con un {MICRODATOS_ANIO.format(year='<año>')} por año")
+    parser.add_argument("--salida", default=".", help="raíz donde se escriben los datos del tablero")
+    parser.add_argument("--bloque", type=int, default=200_000, help="filas leídas por vez de cada archivo")
+    parser.add_argument("--procesos", type=int, help="procesos en paralelo (por defecto, uno por CPU)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    try:
+        resumen = ingerir(args.microdatos, args.salida, args.bloque, args.procesos)
+    except (FileNotFoundError, AnioFueraDeRango) as error:
+        parser.error(str(error))
+    for year, filas, descartes in resumen:
+        print(f"{year}: {filas:,} escuelas, {descartes:,} niveles descartados por inconsistencias")
+    print(f"{sum(filas for _, filas, _ in resumen):,} escuelas en {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import importlib.metadata
+import json
+
+import branca.colormap
+import folium
+import folium.plugins
+import numpy as np
+import pandas as pd
+import shapely
+import streamlit as st
+import streamlit_folium
+from folium.elements import JSCSSMixin
+from folium.features import GeoJsonTooltip
+from shapely.geometry import mapping, shape
+
+from datos import ANIOS, extranjeros_anio, extranjeros_version, version_extranjeros
+from rendimiento import tramo
+
+GEOJSON_PROVINCIAS = "provincias.geojson"
+
+# renderizar_mapa y mostrar_mapa repiten lo que hace st_folium con funciones
+# internas de streamlit_folium, que pueden cambiar sin aviso de una versión a
+# otra: con otra versión instalada la app no arranca, en lugar de fallar a medias
+VERSION_STREAMLIT_FOLIUM = "0.23.1"
+INTERNOS_STREAMLIT_FOLIUM = ["_get_map_string", "_get_siblings", "_component_func", "get_full_id", "generate_js_hash"]
+
+
+def verificar_streamlit_folium():
+    instalada = importlib.metadata.version("streamlit-folium")
+    faltantes = [nombre for nombre in INTERNOS_STREAMLIT_FOLIUM if not hasattr(streamlit_folium, nombre)]
+    if instalada != VERSION_STREAMLIT_FOLIUM or faltantes:
+        raise ImportError(
+            f"mapa.py está hecho para streamlit-folium {VERSION_STREAMLIT_FOLIUM} y está instalada la "
+            f"{instalada}{' (sin ' + ', '.join(faltantes) + ')' if faltantes else ''}: revisar renderizar_mapa "
+            f"y mostrar_mapa contra st_folium de esa versión y actualizar VERSION_STREAMLIT_FOLIUM")
+
+
+verificar_streamlit_folium()
+
+PORCENTAJES_MAPA = ["porcentaje_Bolivia", "porcentaje_Paraguay", "porcentaje_Perú",
+                    "porcentaje_Venezuela", "porcentaje_Otros"]
+
+NACIONALIDADES_MAPA = {
+    "Bolivia": "porcentaje_Bolivia",
+    "Paraguay": "porcentaje_Paraguay",
+    "Perú": "porcentaje_Perú",
+    "Venezuela": "porcentaje_Venezuela",
+    "Otros": "porcentaje_Otros",
+}
+
+# escala secuencial en la gama del mapa por año, una clase por quintil
+PALETA_CLASES = ['#feebe2', '#fbb4b9', '#f768a1', '#c51b8a', '#7a0177']
+COLOR_SIN_DATOS = '#808080'
+
+# a zoom 4 un píxel cubre ~0.08° en las latitudes del país: con 0.02° de
+# tolerancia y 3 decimales (~100 m) la simplificación no se nota ni acercando
+# el mapa un par de niveles con los botones de zoom
+TOLERANCIA_SIMPLIFICACION = 0.02
+DECIMALES_COORDENADAS = 3
+
+
+@st.cache_resource(show_spinner=False)
+def cargar_provincias():
+    with open(GEOJSON_PROVINCIAS, 'r') as f:
+        return json.load(f)
+
+
+def simplificar_provincias(provincias_geojson, tolerancia=TOLERANCIA_SIMPLIFICACION,
+                           decimales=DECIMALES_COORDENADAS):
+    # simplificación de cobertura: los bordes compartidos entre provincias se
+    # simplifican una sola vez, así no aparecen huecos ni solapamientos nuevos
+    features = provincias_geojson['features']
+    geometrias = shapely.coverage_simplify([shape(f['geometry']) for f in features], tolerancia)
+    # el redondeo es por vértice, los vértices compartidos siguen coincidiendo
+    geometrias = shapely.transform(geometrias, lambda coords: np.round(coords, decimales))
+
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {'type': f['type'], 'properties': f['properties'], 'geometry': mapping(geometria)}
+            for f, geometria in zip(features, geometrias)
+        ],
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def cargar_provincias_simplificadas():
+    return simplificar_provincias(cargar_provincias())
+
+
+def columnas_anio(year):
+    # las nacionalidades con datos en el año (Venezuela se discrimina desde 2014)
+    data = extranjeros_anio(year)
+    return [col for col in PORCENTAJES_MAPA if data[col].notna().any()]
+
+
+def campos_tooltip(year):
+    # (propiedad del geojson, etiqueta) que muestra el tooltip de cada provincia
+    nacionalidades = {columna: nombre for nombre, columna in NACIONALIDADES_MAPA.items()}
+    return [('nombre', "Provincia")] + [(col, f"% {nacionalidades[col]}:") for col in columnas_anio(year)]
+
+
+# un FeatureCollection enriquecido por año, construido una sola vez por versión
+# de los datos (datos.version_extranjeros). Las geometrías se comparten con el
+# geojson base y cada feature es un dict nuevo, así ninguna sesión modifica
+# datos que ve otra
+@st.cache_resource(show_spinner=False, max_entries=13)
+def geojson_anio(year, version):
+    datos_anio = extranjeros_version(version).xs(year, level="anio")
+    porcentajes = datos_anio[columnas_anio(year)].astype(float).to_dict(orient="index")
+
+    features = []
+    for feature in cargar_provincias_simplificadas()['features']:
+        propiedades = dict(feature['properties'])
+        propiedades.update(porcentajes.get(propiedades['nombre'], {}))
+        features.append({
+            'type': feature['type'],
+            'properties': propiedades,
+            'geometry': feature['geometry'],
+        })
+
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def construir_mapa(year, provincias_geojson):
+    mapa = folium.Map(location=[-40.4161, -63.6167], zoom_start=4, scrollWheelZoom=False, touchZoom=True)
+
+    campos = campos_tooltip(year)
+    fields = [campo for campo, _ in campos]
+    aliases = [alias for _, alias in campos]
+
+    folium.GeoJson(
+        provincias_geojson,
+        name="Provincias",
+        style_function=lambda x: {
+            'fillColor': '#ff1493',
+            'color': 'black',
+            'weight': 1,
+            'fillOpacity': 0.4,
+        },
+        tooltip=GeoJsonTooltip(
+            fields=fields,
+            aliases=aliases,
+            localize=True,
+            sticky=True
+        )
+    ).add_to(mapa)
+
+    return mapa
+
+
+def renderizar_mapa(mapa):
+    # lo mismo que hace st_folium antes de llamar al componente (versión fijada
+    # en requirements.txt), separado para poder guardar el resultado
+    mapa.render()
+    leaflet = streamlit_folium._get_map_string(mapa)
+
+    css_links, js_links = [], []
+
+    def recorrer(elemento):
+        if isinstance(elemento, JSCSSMixin):
+            css_links.extend(href for _, href in elemento.default_css)
+            js_links.extend(src for _, src in elemento.default_js)
+        for hijo in elemento._children.values():
+            recorrer(hijo)
+
+    recorrer(mapa)
+
+    southwest, northeast = mapa.get_bounds()
+    return {
+        'script': leaflet,
+        'html': streamlit_folium._get_siblings(mapa),
+        'id': streamlit_folium.get_full_id(mapa),
+        'key': streamlit_folium.generate_js_hash(leaflet),
+        'css_links': css_links,
+        'js_links': js_links,
+        'default': {
+            "last_clicked": None,
+            "last_object_clicked": None,
+            "last_object_clicked_tooltip": None,
+            "last_object_clicked_popup": None,
+            "all_drawings": None,
+            "last_active_drawing": None,
+            "bounds": {
+                "_southWest": {"lat": southwest[0], "lng": southwest[1]},
+                "_northEast": {"lat": northeast[0], "lng": northeast[1]},
+            },
+            "zoom": mapa.options.get("zoom"),
+            "last_circle_radius": None,
+            "last_circle_polygon": None,
+            "selected_layers": None,
+        },
+    }
+
+
+# el mapa ya serializado de cada año: en cada rerun sólo se reenvía al componente
+@st.cache_resource(show_spinner=False, max_entries=13)
+def mapa_renderizado(year, version):
+    # sólo se mide cuando no está en cache, que es cuando se arma el geojson
+    with tramo("geojson", anio=year):
+        provincias_geojson = geojson_anio(year, version)
+    return renderizar_mapa(construir_mapa(year, provincias_geojson))
+
+
+def mostrar_mapa(year, height=700, returned_objects=None):
+    renderizado = dict(mapa_renderizado(year, version_extranjeros()))
+    # como en st_folium: sólo los objetos pedidos provocan un rerun al cambiar
+    if returned_objects is not None:
+        renderizado['default'] = {k: v for k, v in renderizado['default'].items() if k in returned_objects}
+
+    return streamlit_folium._component_func(
+        **renderizado,
+        height=height,
+        width=None,
+        returned_objects=returned_objects,
+        zoom=None,
+        center=None,
+        feature_group=None,
+        return_on_hover=False,
+        layer_control=None,
+        pixelated=False,
+    )
+
+
+# cortes por cuantiles de cada nacionalidad, calculados una sola vez sobre
+# todos los años juntos para que los colores sean comparables entre años
+@st.cache_resource(show_spinner=False, max_entries=2)
+def clases_porcentajes(version):
+    data = extranjeros_version(version)[PORCENTAJES_MAPA]
+    clases, cortes = {}, {}
+    for col in PORCENTAJES_MAPA:
+        clases[col], cortes[col] = pd.qcut(data[col], q=len(PALETA_CLASES), labels=False,
+                                           retbins=True, duplicates="drop")
+    return pd.DataFrame(clases), cortes
+
+
+# mapa con deslizador de años: los 13 años viajan en un solo geojson y el
+# cambio de año se resuelve en el navegador, sin rerun del servidor
+@st.cache_resource(show_spinner=False, max_entries=len(NACIONALIDADES_MAPA))
+def mapa_evolucion_html(nacionalidad, version):
+    columna = NACIONALIDADES_MAPA[nacionalidad]
+    clases, cortes = clases_porcentajes(version)
+    porcentajes = extranjeros_version(version)[columna]
+    # a mitad de año, para que la zona horaria del navegador no cambie el año mostrado
+    timestamps = {year: str(int(pd.Timestamp(year=year, month=7, day=1).timestamp())) for year in ANIOS}
+    anios = [year for year in ANIOS if porcentajes.xs(year, level="anio").notna().all()]
+
+    features, styledict = [], {}
+    for i, feature in enumerate(cargar_provincias_simplificadas()['features']):
+        nombre = feature['properties']['nombre']
+        propiedades = {'nombre': nombre}
+        estilos = {}
+        for year in ANIOS:
+            clase = clases.at[(year, nombre), columna]
+            if pd.isna(clase):
+                estilos[timestamps[year]] = {'color': COLOR_SIN_DATOS, 'opacity': 0.2}
+            else:
+                estilos[timestamps[year]] = {'color': PALETA_CLASES[int(clase)], 'opacity': 0.8}
+                propiedades[str(year)] = float(porcentajes.at[(year, nombre)])
+        features.append({
+            'type': feature['type'],
+            'id': str(i),
+            'properties': propiedades,
+            'geometry': feature['geometry'],
+        })
+        styledict[str(i)] = estilos
+
+    provincias_geojson = {'type': 'FeatureCollection', 'features': features}
+
+    mapa = folium.Map(location=[-40.4161, -63.6167], zoom_start=4, scrollWheelZoom=False, touchZoom=True)
+    folium.plugins.TimeSliderChoropleth(
+        provincias_geojson,
+        styledict=styledict,
+        date_options="YYYY",
+        stroke_color='black',
+    ).add_to(mapa)
+
+    # capa transparente por encima, sólo para el tooltip con la serie de la provincia
+    folium.GeoJson(
+        provincias_geojson,
+        style_function=lambda x: {'fillOpacity': 0, 'weight': 0},
+        tooltip=GeoJsonTooltip(
+            fields=['nombre'] + [str(year) for year in anios],
+            aliases=["Provincia"] + [f"% {nacionalidad} {year}:" for year in anios],
+            localize=True,
+            sticky=True
+        )
+    ).add_to(mapa)
+
+    branca.colormap.StepColormap(
+        PALETA_CLASES[:len(cortes[columna]) - 1],
+        index=list(cortes[columna]),
+        vmin=float(cortes[columna][0]),
+        vmax=float(cortes[columna][-1]),
+        caption=f"% de estudiantes de {nacionalidad} entre los extranjeros",
+    ).add_to(mapa)
+
+    return mapa.get_root().render()
@@ -0,0 +1,41 @@
+import streamlit as st
+
+from datos import ANIOS
+from graficos import mostrar_grafico
+
+
+def beneficios():
+    st.title("Beneficios Alimenticios Gratuitos")
+    st.write(
+        """
+        Esta sección presenta la información detallada sobre los establecimientos
+        educativos divididos en primario y secundario, que ofrecen a sus alumnos/as
+        beneficios alimenticios gratuitos a lo largo del país. Podrás explorar estos
+        datos separándolos por año y por nivel educativo. Los porcentajes reflejan la
+        cantidad de establecimientos que ofrecen el beneficio, destacamos la importancia
+        del acceso a la alimentación para un fructífero desarrollo de los/as estudiantes.
+        """
+    )
+
+    year = st.selectbox("Selecciona el año:", ANIOS)
+    nivel = st.selectbox("Selecciona el nivel educativo:", ["Primaria", "Secundaria"])
+    nivel = nivel.lower()
+
+    opciones_tipo = {
+        "Total de escuelas": "total",
+        "Escuelas con extranjeros": "con_extranjeros",
+        "Escuelas sin extranjeros": "sin_extranjeros"
+    }
+
+    seleccion = st.selectbox("Selecciona el tipo de escuela:", list(opciones_tipo.keys()))
+
+    tipo = opciones_tipo[seleccion]
+
+    st.markdown("---")
+
+    c1, c2= st.columns([1,0.7])
+    with c2:
+        mostrar_grafico("beneficios", "comida", "torta", tipo, nivel, year, fraccion=0.7/1.7)
+
+    with c1:
+        mostrar_grafico("beneficios", "comida", "barras", tipo, nivel, year, fraccion=1/1.7)
@@ -0,0 +1,35 @@
+import sqlite3
+
+import streamlit as st
+
+from buzon import buzon
+
+
+def contacto():
+    st.title("Contacto")
+    st.write("Si tienes preguntas o feedback, no dudes en contactarnos.")
+    st.subheader("Formulario de Contacto")
+
+    name = st.text_input("Tu Nombre")
+    email = st.text_input("Tu Correo Electrónico")
+    message = st.text_area("Tu Mensaje")
+
+    if st.button("Enviar"):
+        if name and email and message:
+            form_data = {
+                'name': name,
+                'email': email,
+                'message': message
+            }
+            # el envío real lo hace el buzón en segundo plano
+            try:
+                nuevo = buzon().encolar(form_data)
+            except sqlite3.Error:
+                st.error("Error al enviar el mensaje.")
+            else:
+                if nuevo:
+                    st.success("¡Mensaje enviado con éxito!")
+                else:
+                    st.info("Este mensaje ya fue enviado.")
+        else:
+            st.warning("Por favor, completa todos los campos.")
@@ -0,0 +1,35 @@
+import streamlit as st
+
+from datos import ANIOS
+from imagenes import mostrar_imagen
+
+
+def general():
+   
+    col1, col2, col3= st.columns([1,10, 1])
+
+    with col2:
+        st.title("Distribución de Nacionalidades Extranjeras en Argentina")
+
+
+    with col2:
+        st.write(
+        """
+            En esta sección podes conocer cómo se distribuyen los/as alumnos/as extranjeros/as
+            de nivel primario y secundario en Argentina mediante gráficos de barras.
+            Nos enfocaremos en las nacionalidades más representativas en cantidad en el país:
+            Bolivia, Paraguay, Perú y Venezuela. Se presentan especialmente las cinco provincias
+            con mayor concentración de estas comunidades migrantes, lo que permitirá comprender
+            mejor su distribución a nivel nacional.
+            """
+        )
+        year = st.selectbox("Selecciona el año:", ANIOS)
+        st.markdown("---")
+    
+    countries = ["Bolivia", "Paraguay", "Perú", "Venezuela"]
+
+    for i, country in enumerate(countries):
+        with col2:
+            st.subheader(country)
+            mostrar_imagen("general", f"distribucion_{country}", anio=year, fraccion=10/12)
+            st.markdown("---")
@@ -0,0 +1,45 @@
+import streamlit as st
+
+from datos import ANIOS
+from graficos import mostrar_grafico
+
+
+def infraestructura():
+    st.title("Infraestructuras Escolares Esenciales")
+    st.write(
+        """
+        En esta sección exploramos las condiciones de infraestructura de los establecimientos
+        educativos a los que asisten estudiantes migrantes de los niveles primario y secundario
+        en toda la Argentina. Analizamos aspectos clave como la disponibilidad de bibliotecas,
+        la conexión a internet y si cuentan con electricidad, consideradas como elementos y
+        necesidades esenciales para un ambiente de aprendizaje. Esta información permite comprender
+        y visibilizar claramente las oportunidades y desafíos que enfrentan estas instituciones en
+        cuanto a recursos y servicios básicos.
+        """
+    )
+
+    opciones_tipo = {
+        "Total de escuelas": "total",
+        "Escuelas con extranjeros": "con_extranjeros",
+        "Escuelas sin extranjeros": "sin_extranjeros"
+    }
+
+    infraestructura = st.selectbox("Selecciona el recurso de infraestructura:", ["Electricidad", "Conexión a Internet", "Biblioteca"])
+    infraestructura = "internet" if infraestructura == "Conexión a Internet" else infraestructura
+    infraestructura = infraestructura.lower()
+
+    seleccion = st.selectbox("Selecciona el tipo de escuela:", ["Total de escuelas", "Escuelas con extranjeros", "Escuelas sin extranjeros"])
+
+    year = st.selectbox("Selecciona el año:", ANIOS)
+
+    st.markdown("---")
+
+    tipo = opciones_tipo[seleccion]
+
+    c1, c2= st.columns([1,1])
+    with c2:
+        col1, col2 = st.columns([0.2,2])
+        with col2:
+            mostrar_grafico("infraestructura", infraestructura, "torta", tipo, anio=year, fraccion=0.5 * 2/2.2)
+    with c1:
+        mostrar_grafico("infraestructura", infraestructura, "barras", tipo, anio=year, fraccion=0.5)
@@ -0,0 +1,45 @@
+import streamlit as st
+
+
+def home():
+
+
+    p1, p2, p3 = st.columns([1,7,1])
+    with p2:
+        st.title("Distribución de Estudiantes Migrantes y Condiciones Estructurales de las Escuelas Argentinas")
+
+        st.write(
+            """
+            Esta aplicación presenta, desde los datos que recolectamos, las condiciones estructurales
+            de los distintos establecimientos educativos a los que asisten niños/as y adolescentes migrantes
+            en Argentina, como también nos permite visualizar la distribución de las distintas nacionalidades
+            de los mismos en las provincias del país, con un recorte particular en los cuatro países con mayor
+            cantidad de migrantes: Bolivia, Paraguay, Perú y Venezuela. Se pueden encontrar datos sobre la
+            infraestructa de los establecimientos académicos, la presencia o no de servicios y/o beneficios
+            públicos y gratuitos dentro de los mismos y otros factores relevantes para estos grupos.
+            """
+        )
+        st.markdown("---") 
+
+        st.markdown(
+            """
+            #### Integrantes del Proyecto
+            En orden alfabético:
+            - **Ángeles M. Carrara**. Estudiante de la Licenciatura en Computación, Facultad de Matemática, Astronomía, Física y Computación.
+            - **Antonella G. Giletta**. Estudiante de la Licenciatura en Sociología, Facultad de Ciencias Sociales y de Abogacía, Facultad de Derecho.
+            - **Paola Benitez Siciliano**. Estudiante de la Licenciatura en Sociología, Facultad de Ciencias Sociales.
+            - **Paulina Castillo**. Estudiante de la Licenciatura en Ciencia Política, Facultad de Ciencias Sociales.
+            - **Rocío Perez Sbarato**. Estudiante de la Licenciatura en Computación, Facultad de Matemática, Astronomía, Física y Computación.
+            ---
+            """
+        )
+
+        st.markdown(
+            """            
+            El presente trabajo fue elaborado en el marco de la convocatoria del evento **Socio-hackaton “Investigar en Sociales 2024”**, 
+            en el marco de las **II Jornadas Investigar en Sociales** de la **Facultad de Ciencias Sociales de la Universidad Nacional de Córdoba**.
+            """
+        )
+
+
+        st.markdown("---")
@@ -0,0 +1,158 @@
+import plotly.express as px
+import streamlit as st
+import streamlit.components.v1 as components
+
+from datos import (ANIOS, NACIONALIDADES, TOTAL_PAIS, extranjeros_provincia, tendencias_extranjeros,
+                   version_extranjeros)
+from imagenes import mostrar_imagen
+from mapa import NACIONALIDADES_MAPA, mapa_evolucion_html, mostrar_mapa
+from rendimiento import tramo
+
+
+def estudiantes_extranjeros_por_provincia():
+        
+    st.title("Estudiantes Extranjeros por provincia")
+
+    st.markdown(
+        """
+        Este mapa ilustra la distribución de las diversas nacionalidades extranjeras
+        de los/as estudiantes migrantes que asisten a escuelas primarias y secundarias
+        en cada provincia de la Argentina para el año seleccionado. Al pasar el mouse
+        sobre una provincia, se despliega información detallada con los porcentajes
+        correspondientes a cada nacionalidad presente en esa región. Al hacer click
+        en una provincia, se mostrarán los valores totales en relación con esos
+        porcentajes, brindando una visión más clara de cómo se distribuyen las
+        nacionalidades en el sistema educativo argentino. Por defecto, se encuentra
+        seleccionada la provincia de Córdoba.
+        """
+    )
+
+    evolucion = f"Evolución {ANIOS[0]}-{ANIOS[-1]}"
+    modo = st.radio("Modo del mapa:", ["Por año", evolucion, "Tendencia por provincia"],
+                    horizontal=True)
+    prov = 'Córdoba'
+
+    if modo == evolucion:
+        evolucion_por_provincia()
+        return prov
+
+    if modo == "Tendencia por provincia":
+        return tendencia_por_provincia(prov)
+
+    year = st.selectbox("Selecciona el año:", ANIOS, index=0)
+
+    with st.expander(f"Información Completa del año {year}", expanded=False):
+        col1, col2, col3 = st.columns([1, 5, 1])
+        with col2:
+            mostrar_imagen("provincia", "tabla_nacionalidades", anio=year, fraccion=5/7)
+
+    st.markdown("---")
+
+    prov = mapa_y_datos(year)
+
+    return prov
+
+# el click sobre el mapa sólo vuelve a ejecutar este fragmento (mapa y métricas);
+# el cambio de año o de página sigue provocando un rerun completo
+@st.fragment
+def mapa_y_datos(year):
+    prov = 'Córdoba'
+
+    col1, col2 = st.columns([4, 6])
+
+    with col1:
+        p1, p2 = st.columns([12, 1])
+
+        with p1:
+            with tramo("folium", anio=year):
+                st_mapa = mostrar_mapa(year, returned_objects=['last_active_drawing'])
+
+            if st_mapa['last_active_drawing']:
+                prov = st_mapa['last_active_drawing']['properties']['nombre']
+
+
+    with col2:
+
+        if (prov != ''):
+            with tramo("datos", anio=year):
+                row = extranjeros_provincia(year, prov)
+            if row is not None:
+                st.subheader(f'Datos para {prov} en el año {year}')
+                string_format = "{:,}"
+                # hasta 2013 Venezuela viene vacía: esas métricas no se muestran
+                row = row.dropna()
+
+                cantidades = [("Total Extranjeros", 'total_extranjeros'), ("Bolivia", 'Bolivia'),
+                              ("Paraguay", 'Paraguay'), ("Perú", 'Perú'), ("Venezuela", 'Venezuela'),
+                              ("Otros", 'Otros')]
+                cantidades = [(etiqueta, col) for etiqueta, col in cantidades if col in row]
+                for c, (etiqueta, col) in zip(st.columns(6), cantidades):
+                    with c:
+                        st.metric(etiqueta, string_format.format(int(row[col])))
+
+                porcentajes = [(f"Porcentaje {nombre}", f"porcentaje_{nombre}")
+                               for nombre in ["Bolivia", "Paraguay", "Perú", "Venezuela", "Otros"]]
+                porcentajes = [(etiqueta, col) for etiqueta, col in porcentajes if col in row]
+                for e, (etiqueta, col) in zip(st.columns(5), porcentajes):
+                    with e:
+                        st.metric(etiqueta, f"{string_format.format(float(row[col]))} %")
+
+
+
+    return prov
+
+def evolucion_por_provincia():
+    st.write(
+        f"""
+        En este modo cada provincia se colorea según el porcentaje que representa la
+        nacionalidad elegida sobre el total de estudiantes extranjeros/as. Moviendo el
+        deslizador sobre el mapa se recorren los años de {ANIOS[0]} a {ANIOS[-1]}; los colores usan
+        los mismos cortes para todos los años, así se pueden comparar entre sí.
+        """
+    )
+
+    nacionalidad = st.selectbox("Selecciona la nacionalidad:", list(NACIONALIDADES_MAPA.keys()))
+
+    st.markdown("---")
+
+    col1, col2, col3 = st.columns([1, 5, 1])
+    with col2:
+        components.html(mapa_evolucion_html(nacionalidad, version_extranjeros()), height=760)
+
+def tendencia_por_provincia(prov):
+    st.write(
+        f"""
+        En este modo se ve, para la provincia elegida, cómo cambió entre {ANIOS[0]} y {ANIOS[-1]}
+        el porcentaje que representa cada nacionalidad sobre el total de estudiantes
+        extranjeros/as. Las líneas punteadas muestran el mismo porcentaje para todo el
+        país, como referencia. Al pasar el mouse sobre un año se muestra también la
+        variación respecto del año anterior, en puntos porcentuales.
+        """
+    )
+
+    tendencias = tendencias_extranjeros(version_extranjeros())
+    provincias = sorted(set(tendencias["provincia"]) - {TOTAL_PAIS})
+    prov = st.selectbox("Selecciona la provincia:", provincias, index=provincias.index(prov))
+
+    st.markdown("---")
+
+    datos = tendencias[tendencias["provincia"].isin([prov, TOTAL_PAIS])]
+    fig = px.line(
+        datos, x="anio", y="porcentaje", color="nacionalidad", line_dash="provincia",
+        line_dash_map={prov: "solid", TOTAL_PAIS: "dot"}, category_orders={"nacionalidad": NACIONALIDADES},
+        markers=True, custom_data=["variacion"],
+        labels={"anio": "Año", "porcentaje": "% sobre el total de extranjeros/as",
+                "nacionalidad": "Nacionalidad", "provincia": ""},
+    )
+    fig.update_traces(hovertemplate="%{y:.2f} % (%{customdata[0]:+.2f} p.p.)")
+    fig.update_layout(hovermode="x unified", xaxis={"dtick": 1}, height=550)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader(f"Variación interanual en {prov} (puntos porcentuales)")
+    variaciones = (datos[datos["provincia"] == prov]
+                   .pivot(index="anio", columns="nacionalidad", values="variacion")
+                   .reindex(columns=NACIONALIDADES)
+                   .dropna(how="all"))
+    st.dataframe(variaciones.style.format("{:+.2f}", na_rep="-"), use_container_width=True)
+
+    return prov
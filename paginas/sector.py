@@ -0,0 +1,42 @@
+import streamlit as st
+
+from datos import ANIOS
+from graficos import mostrar_grafico
+
+
+def sector():
+    st.title("Sectores Público y Privado")
+    st.write(
+        """
+        En esta sección comparamos la distribución de los establecimientos educativos
+        que ofrecen un servicio público o privado a sus alumnos/as en Argentina.
+        Puedes seleccionar diferentes años y opciones de los establecimientos para
+        observar cómo se distribuyen las instituciones educativas y cómo varía según
+        la presencia de estudiantes extranjeros/as según cada servicio. Este análisis
+        es clave para entender las dinámicas de inclusión para la población migrante
+        y el acceso gratuito o pago que tienen en la educación en el país.
+        """
+    )
+
+    year = st.selectbox("Selecciona el año:", ANIOS)
+
+    opciones_tipo = {
+        "Total de escuelas": "total",
+        "Escuelas con extranjeros": "con_extranjeros",
+        "Escuelas sin extranjeros": "sin_extranjeros"
+    }
+
+    seleccion = st.selectbox("Selecciona el tipo de escuela:", list(opciones_tipo.keys()))
+
+    tipo = opciones_tipo[seleccion]
+
+    st.markdown("---")
+
+    c1, c2= st.columns([1,1])
+    with c2:
+        col1, col2 = st.columns([0.2,2])
+        with col2:
+            mostrar_grafico("sector", "sector", "torta", tipo, anio=year, fraccion=0.5 * 2/2.2)
+
+    with c1:
+            mostrar_grafico("sector", "sector", "barras", tipo, anio=year, fraccion=0.5)
@@ -0,0 +1,114 @@
+import contextlib
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# se activa para todas las sesiones con la variable de entorno, o para una sola
+# agregando ?debug=rendimiento a la URL
+ACTIVO_POR_ENTORNO = os.environ.get("DEBUG_RENDIMIENTO") == "1"
+PARAMETRO_DEBUG = "rendimiento"
+
+# cuántas mediciones por etapa se guardan para calcular p50/p95
+VENTANA_PERCENTILES = 500
+
+_NULO = contextlib.nullcontext()
+
+logger = logging.getLogger("rendimiento")
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class Historial:
+    # últimas mediciones de cada etapa, de todas las sesiones del proceso
+
+    def __init__(self, largo):
+        self.largo = largo
+        self._etapas = {}
+        self._lock = threading.Lock()
+
+    def agregar(self, etapa, ms):
+        with self._lock:
+            self._etapas.setdefault(etapa, deque(maxlen=self.largo)).append(ms)
+
+    def percentiles(self):
+        with self._lock:
+            etapas = {etapa: list(valores) for etapa, valores in self._etapas.items()}
+        filas = []
+        for etapa, valores in sorted(etapas.items()):
+            if len(valores) > 1:
+                cortes = statistics.quantiles(valores, n=20, method="inclusive")
+                p50, p95 = statistics.median(valores), cortes[18]
+            else:
+                p50 = p95 = valores[0]
+            filas.append({"etapa": etapa, "n": len(valores), "p50 (ms)": round(p50, 2), "p95 (ms)": round(p95, 2)})
+        return filas
+
+
+@st.cache_resource(show_spinner=False)
+def historial():
+    return Historial(VENTANA_PERCENTILES)
+
+
+def iniciar_rerun(pagina):
+    activo = ACTIVO_POR_ENTORNO or st.query_params.get("debug") == PARAMETRO_DEBUG
+    st.session_state["_rendimiento_activo"] = activo
+    st.session_state["_rendimiento_pagina"] = pagina
+    if activo:
+        st.session_state["_rendimiento_tramos"] = []
+
+
+class Tramo:
+
+    def __init__(self, etapa, contexto):
+        self.etapa = etapa
+        self.contexto = contexto
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        ctx = get_script_run_ctx()
+        registro = {
+            "ts": round(time.time(), 3),
+            "sesion": ctx.session_id if ctx else None,
+            "pagina": st.session_state.get("_rendimiento_pagina"),
+            "etapa": self.etapa,
+            "ms": round(ms, 3),
+            **self.contexto,
+        }
+        logger.info(json.dumps(registro, ensure_ascii=False))
+        st.session_state.setdefault("_rendimiento_tramos", []).append(registro)
+        historial().agregar(self.etapa, ms)
+        return False
+
+
+def tramo(etapa, **contexto):
+    # con la medición apagada sólo cuesta una consulta al session_state
+    if not st.session_state.get("_rendimiento_activo", False):
+        return _NULO
+    return Tramo(etapa, contexto)
+
+
+def panel_rendimiento():
+    if not st.session_state.get("_rendimiento_activo", False):
+        return
+
+    with st.sidebar.expander("Rendimiento", expanded=True):
+        st.caption("Último rerun")
+        tramos = st.session_state.get("_rendimiento_tramos", [])
+        st.table([{"etapa": t["etapa"], "ms": round(t["ms"], 2)} for t in tramos])
+        st.caption(f"Últimas {VENTANA_PERCENTILES} mediciones por etapa, todas las sesiones")
+        st.table(historial().percentiles())
@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture(autouse=True)
+def raiz(monkeypatch):
+    # las rutas de datos son relativas a la raíz del repositorio, como al correr la app
+    monkeypatch.chdir(RAIZ)
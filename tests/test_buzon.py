@@ -0,0 +1,175 @@
+# el buzón de contacto contra un servidor HTTP local que responde bien, falla
+# o es más lento que el timeout: qué termina entregando, que el hilo de envío
+# sobreviva a los errores y que los pendientes salgan al arrancar la app
+import os
+import sqlite3
+import time
+from unittest import mock
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.contacto import esperar, mensaje, servidor_stub
+from buzon import Buzon, buzon, buzon_proceso
+
+# reintentos rápidos para que cada prueba dure segundos y no horas
+ESPERA_INICIAL = 0.1
+ESPERA_MAXIMA = 0.4
+TIMEOUT = (0.5, 1)
+
+
+@pytest.fixture
+def crear_buzon(tmp_path):
+    creados = []
+
+    def crear(url, **kwargs):
+        nuevo = Buzon(str(tmp_path / "buzon.sqlite3"), url, espera_inicial=ESPERA_INICIAL,
+                      espera_maxima=ESPERA_MAXIMA, timeout=TIMEOUT, **kwargs)
+        creados.append(nuevo)
+        return nuevo
+
+    yield crear
+    for creado in creados:
+        creado.detener()
+
+
+@pytest.fixture
+def buzon_de_prueba(tmp_path):
+    # el buzón del proceso (el que usa la app) apuntando a una base temporal
+    def entorno(url):
+        return mock.patch.dict(os.environ, {"URL_CONTACTO": url,
+                                            "BUZON_CONTACTO": str(tmp_path / "buzon.sqlite3")})
+
+    buzon_proceso.clear()
+    yield entorno
+    buzon_proceso().detener()
+    buzon_proceso.clear()
+
+
+def test_entrega_todos_los_mensajes(crear_buzon):
+    with servidor_stub([200]) as (url, recibidos):
+        buzon = crear_buzon(url)
+        for i in range(20):
+            assert buzon.encolar(mensaje(i))
+        assert esperar(lambda: buzon.estado()["enviados"] == 20, 10)
+    assert len(recibidos) == 20
+
+
+def test_mismo_mensaje_dos_veces_se_envia_una(crear_buzon):
+    with servidor_stub([200]) as (url, recibidos):
+        buzon = crear_buzon(url)
+        assert buzon.encolar(mensaje(0))
+        assert not buzon.encolar(mensaje(0))
+        assert esperar(lambda: buzon.estado()["pendientes"] == 0, 10)
+    assert buzon.estado()["enviados"] == 1
+    assert len(recibidos) == 1
+
+
+def test_mismo_mensaje_mas_tarde_es_otro_mensaje(crear_buzon):
+    with servidor_stub([200]) as (url, recibidos):
+        buzon = crear_buzon(url, ventana_duplicados=0.2)
+        assert buzon.encolar(mensaje(0))
+        time.sleep(0.3)
+        assert buzon.encolar(mensaje(0))
+        assert esperar(lambda: buzon.estado()["enviados"] == 2, 10)
+    assert len(recibidos) == 2
+
+
+def test_falla_y_luego_responde(crear_buzon):
+    with servidor_stub([500, 503, 200]) as (url, recibidos):
+        buzon = crear_buzon(url)
+        buzon.encolar(mensaje(0))
+        assert esperar(lambda: buzon.estado()["enviados"] == 1, 10)
+    assert len(recibidos) == 3
+
+
+def test_sigue_reintentando_si_siempre_falla(crear_buzon):
+    # sin máximo de intentos: el mensaje queda pendiente hasta que el servicio vuelva
+    with servidor_stub([500]) as (url, recibidos):
+        buzon = crear_buzon(url)
+        buzon.encolar(mensaje(0))
+        assert esperar(lambda: len(recibidos) >= 12, 10)
+    estado = buzon.estado()
+    assert estado["enviados"] == 0
+    assert estado["pendientes"] == 1
+    assert estado["intentos"] >= 11
+
+
+def test_servidor_lento_no_demora_la_pagina(crear_buzon):
+    with servidor_stub([200], demora=3) as (url, recibidos):
+        buzon = crear_buzon(url)
+        inicio = time.perf_counter()
+        buzon.encolar(mensaje(0))
+        assert time.perf_counter() - inicio < TIMEOUT[1]
+        assert esperar(lambda: buzon.estado()["intentos"] >= 2, 10)
+    assert buzon.estado()["pendientes"] == 1
+
+
+def test_un_error_de_la_base_no_termina_el_hilo(crear_buzon, monkeypatch):
+    original = Buzon._repartir_siguiente
+    fallas = []
+
+    def repartir_siguiente(self, conexion):
+        if len(fallas) < 2:
+            fallas.append(time.perf_counter())
+            raise sqlite3.OperationalError("database is locked")
+        return original(self, conexion)
+
+    monkeypatch.setattr(Buzon, "_repartir_siguiente", repartir_siguiente)
+    with servidor_stub([200]) as (url, recibidos):
+        buzon = crear_buzon(url)
+        buzon.encolar(mensaje(0))
+        assert esperar(lambda: buzon.estado()["enviados"] == 1, 10)
+    assert len(fallas) == 2
+    assert buzon._hilo.is_alive()
+
+
+def test_un_mensaje_ilegible_no_frena_a_los_demas(crear_buzon, tmp_path):
+    with servidor_stub([200]) as (url, recibidos):
+        buzon = crear_buzon(url)
+        with sqlite3.connect(tmp_path / "buzon.sqlite3") as conexion:
+            conexion.execute("INSERT INTO mensajes (clave, datos, creado, proximo_intento)"
+                             " VALUES ('roto', '{', 0, 0)")
+        buzon.encolar(mensaje(0))
+        assert esperar(lambda: buzon.estado()["enviados"] == 1, 10)
+    assert buzon.estado()["pendientes"] == 1
+    assert buzon._hilo.is_alive()
+
+
+def test_buzon_vuelve_a_iniciar_un_hilo_terminado(buzon_de_prueba):
+    with servidor_stub([200]) as (url, recibidos), buzon_de_prueba(url):
+        with mock.patch.object(Buzon, "_repartir", lambda self: None):
+            actual = buzon()
+        actual._hilo.join()
+
+        assert buzon() is actual
+        assert actual._hilo.is_alive()
+        actual.encolar(mensaje(0))
+        assert esperar(lambda: len(recibidos) == 1, 10)
+
+
+def test_pendiente_de_otra_ejecucion_se_envia_al_arrancar_la_app(crear_buzon, buzon_de_prueba):
+    # el servicio falla, la app se reinicia y nadie usa el formulario: el buzón
+    # del nuevo proceso envía el pendiente al abrir cualquier página
+    with servidor_stub([500]) as (url, fallidos):
+        anterior = crear_buzon(url)
+        anterior.encolar(mensaje(0))
+        assert esperar(lambda: len(fallidos) >= 3, 10)
+        anterior.detener()
+
+    with servidor_stub([200]) as (url, recibidos), buzon_de_prueba(url):
+        at = AppTest.from_file("app.py", default_timeout=60)
+        at.run()
+        assert not at.exception
+        assert esperar(lambda: len(recibidos) == 1, 20)
+        assert buzon().estado() == {"enviados": 1, "pendientes": 0, "intentos": 0}
+
+
+def test_la_app_arranca_aunque_no_se_pueda_abrir_el_buzon(tmp_path):
+    buzon_proceso.clear()
+    ruta = str(tmp_path / "no_existe" / "buzon.sqlite3")
+    with mock.patch.dict(os.environ, {"BUZON_CONTACTO": ruta}):
+        at = AppTest.from_file("app.py", default_timeout=60)
+        at.run()
+    assert not at.exception
+    assert at.title
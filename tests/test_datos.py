@@ -0,0 +1,56 @@
+# el DataFrame compartido que usa la app (cargar_extranjeros, desde el dataset
+# Parquet) tiene que dar exactamente lo mismo que leer cada csv con
+# pd.read_csv: mismas provincias por año y mismo valor en cada columna. Las
+# columnas que un año no trae (Venezuela hasta 2013) tienen que quedar vacías.
+import shutil
+
+import pandas as pd
+import pytest
+
+import datos
+from datos import (ANIOS, COLUMNAS_CANTIDAD, COLUMNAS_PORCENTAJE, cargar_extranjeros, extranjeros_anio,
+                   extranjeros_provincia, leer_extranjeros)
+
+
+def diferencias_anio(year):
+    csv = leer_extranjeros(year).set_index("provincia")
+    compartido = extranjeros_anio(year)
+    diferencias = []
+
+    provincias_csv, provincias_compartido = set(csv.index), set(compartido.index.astype(str))
+    for prov in sorted(provincias_csv ^ provincias_compartido):
+        diferencias.append(f"{year} {prov}: sólo en {'el csv' if prov in provincias_csv else 'el DataFrame'}")
+
+    for prov in sorted(provincias_csv & provincias_compartido):
+        fila = extranjeros_provincia(year, prov)
+        for col in COLUMNAS_CANTIDAD + COLUMNAS_PORCENTAJE:
+            valor = fila[col]
+            if col not in csv:
+                if not pd.isna(valor):
+                    diferencias.append(f"{year} {prov} {col}: {valor}, el csv no trae la columna")
+            elif pd.isna(valor) or valor != csv.at[prov, col]:
+                diferencias.append(f"{year} {prov} {col}: {valor} en el DataFrame, {csv.at[prov, col]} en el csv")
+    return diferencias
+
+
+@pytest.mark.parametrize("year", ANIOS)
+def test_dataframe_compartido_igual_a_los_csv(year):
+    cargar_extranjeros()
+    assert diferencias_anio(year) == []
+
+
+def test_csv_reescrito_se_ve_sin_reiniciar(tmp_path, monkeypatch):
+    # ingesta.py puede reescribir los csv con la app levantada: el cache de
+    # cargar_extranjeros va por versión de los archivos, no por proceso
+    csv = str(tmp_path / "extranjeros_{year}.csv")
+    for year in ANIOS:
+        shutil.copy(datos.CSV_EXTRANJEROS.format(year=year), csv.format(year=year))
+    monkeypatch.setattr(datos, "CSV_EXTRANJEROS", csv)
+    monkeypatch.setattr(datos, "DATASET_EXTRANJEROS", str(tmp_path / "dataset"))
+    antes = extranjeros_provincia(2015, "Córdoba")["Bolivia"]
+
+    df = pd.read_csv(csv.format(year=2015))
+    df.loc[df["provincia"] == "Córdoba", "Bolivia"] += 1
+    df.to_csv(csv.format(year=2015), index=False)
+
+    assert extranjeros_provincia(2015, "Córdoba")["Bolivia"] == antes + 1
@@ -0,0 +1,70 @@
+# el camino de plotly de punta a punta: microdatos sintéticos -> ingesta.py ->
+# tablas de indicadores/ -> un gráfico por indicador, forma, tipo de escuela,
+# nivel y año, como los piden las páginas de beneficios, sector e infraestructura
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import graficos
+from benchmarks.ingesta import generar_anio
+from datos import ANIOS
+from graficos import INDICADORES, TITULOS_TIPO, escuelas_seleccion, version_agregado
+from ingesta import MICRODATOS_ANIO, NIVELES, PRIMER_ANIO_BIBLIOTECA, ingerir
+
+ESCUELAS = 300
+
+
+@pytest.fixture(scope="module")
+def indicadores(tmp_path_factory):
+    microdatos = tmp_path_factory.mktemp("microdatos")
+    salida = tmp_path_factory.mktemp("salida")
+    rng = np.random.default_rng(0)
+    for year in ANIOS:
+        generar_anio(str(microdatos / MICRODATOS_ANIO.format(year=year)), year, ESCUELAS, rng)
+    ingerir(str(microdatos), str(salida), procesos=1)
+    return str(salida / graficos.AGREGADOS_INDICADORES)
+
+
+@pytest.fixture
+def agregados(indicadores, monkeypatch):
+    monkeypatch.setattr(graficos, "AGREGADOS_INDICADORES", indicadores)
+
+
+def todos_los_graficos():
+    from datos import ANIOS
+    from graficos import INDICADORES, TITULOS_TIPO, mostrar_grafico
+    from ingesta import NIVELES
+
+    for indicador in INDICADORES:
+        for forma in ("torta", "barras"):
+            for tipo in TITULOS_TIPO:
+                for nivel in NIVELES if indicador == "comida" else [None]:
+                    for year in ANIOS:
+                        mostrar_grafico("prueba", indicador, forma, tipo, nivel, year)
+
+
+def test_cada_combinacion_se_dibuja(agregados):
+    at = AppTest.from_function(todos_los_graficos, default_timeout=300)
+    at.run()
+    assert not at.exception
+
+    combinaciones = sum(len(NIVELES) if indicador == "comida" else 1 for indicador in INDICADORES)
+    graficos_esperados = combinaciones * 2 * len(TITULOS_TIPO) * len(ANIOS)
+    # la biblioteca no se relevó en 2011: cada forma y tipo de escuela lo avisa
+    sin_datos = [m.value for m in at.markdown if m.value.startswith("Sin datos")]
+    assert sin_datos == ["Sin datos para el año 2011"] * 2 * len(TITULOS_TIPO)
+    assert len(at.get("plotly_chart")) == graficos_esperados - len(sin_datos)
+
+
+@pytest.mark.parametrize("indicador", ["sector", "electricidad", "internet", "biblioteca"])
+def test_cada_escuela_cuenta_una_vez(agregados, indicador):
+    version = version_agregado(indicador)
+    for year in ANIOS:
+        total = escuelas_seleccion(indicador, version, "total", None, year).to_numpy().sum()
+        con = escuelas_seleccion(indicador, version, "con_extranjeros", None, year).to_numpy().sum()
+        sin = escuelas_seleccion(indicador, version, "sin_extranjeros", None, year).to_numpy().sum()
+        if indicador == "biblioteca" and year < PRIMER_ANIO_BIBLIOTECA:
+            assert total == 0
+        else:
+            assert total == ESCUELAS
+        assert con + sin == total
@@ -0,0 +1,11 @@
+import pytest
+
+from ingesta import AnioFueraDeRango, ingerir
+
+
+def test_rechaza_anios_que_el_tablero_no_muestra(tmp_path):
+    (tmp_path / "escuelas_2015.csv").touch()
+    (tmp_path / "escuelas_2024.csv").touch()
+    with pytest.raises(AnioFueraDeRango, match="2024"):
+        ingerir(tmp_path, salida=tmp_path)
+    assert not list(tmp_path.glob("extranjeros_por_provincia/*"))